@@ -51,17 +51,22 @@ If the user provided feedback on a previous answer or solution, incorporate it i
 Below are the available tools you can use for each step:
 {tools}
 
-1. list_tables_tool — Retrieve a list of tables in the Postgres database.
-2. get_schema_tool — Retrieve the schema of a specific table (columns, data types).
+1. list_tables_tool — Retrieve a list of tables in the Postgres database. Not needed for the tables in DATABASE SCHEMA below.
+2. get_schema_tool — Retrieve the schema and sample rows of a table. Only plan it when DATABASE SCHEMA below is not enough, e.g. to see example values.
 3. db_query_tool — Perform SQL queries on the Postgres database to fetch or update candidate data.
 4. match_job_description — Given a job description, find the top matching candidates based on their resume text, returning candidate unique IDs, which can be mapped to 'embeddings_namespace' in the candidates table.
 5. ask_human_feedback — Request clarifications or additional information from the user if needed.
 
+# DATABASE SCHEMA
+
+{schema}
+
 # IMPORTANT NOTES ON POSTGRES QUERIES
 
 - Always ensure you use valid Postgres syntax when constructing queries.
 - Enclose string literals in single quotes. 
 - For pattern matching, use `LIKE` (case-sensitive) or `ILIKE` (case-insensitive).
+- To filter by skill, compare `skills.canonical_name` with equality instead of pattern matching on `skills.name`. Canonical names are lowercase with versions dropped (e.g. `'python'`, `'node.js'`, `'postgresql'`, `'c++'`), and common other spellings are mapped in `skill_aliases` (lowercase `alias` → `canonical_name`, e.g. `'py'` → `'python'`, `'k8s'` → `'kubernetes'`), e.g. `WHERE s.canonical_name = 'python' OR s.canonical_name IN (SELECT canonical_name FROM skill_aliases WHERE alias = 'py')`. The table doesn't cover every spelling, so also canonicalize the user's spelling yourself (lowercase, no version, the usual full name).
 - Use parameterized queries or carefully sanitize inputs to avoid SQL injection.
 - Pay attention to data types. For instance, if you need to compare numeric or date fields, cast them properly if necessary.
 - Only write nested queries when absolutely needed; simpler queries are usually more efficient and easier to debug.
@@ -107,10 +112,10 @@ You have access to external tools to accomplish these objectives.
 Below are the available tools and the key points for using them:
 
 1. **list_tables_tool**
-   - Use this tool if you need to see which tables exist in the database.  
+   - Every table is already listed in DATABASE SCHEMA below; you should not need this tool.  
    
 2. **get_schema_tool**
-   - Use this tool if you need to review a table’s structure (columns and data types).  
+   - DATABASE SCHEMA below already gives every table’s columns, types and join paths. Use this tool only to see sample rows.  
    
 3. **db_query_tool**
    - Use this tool to run **Postgres** queries on the database. 
@@ -118,6 +123,7 @@ Below are the available tools and the key points for using them:
      - **String literals** must be enclosed in single quotes (e.g., `'Data Analyst'`).
      - Use **ILIKE** for case-insensitive matching and **LIKE** for case-sensitive matching.
      - Pay attention to table joins. For example, to get candidates with specific skills, you may need to join `candidates` → `candidate_skills` → `skills`.
+     - Filter skills with equality on the lowercase `skills.canonical_name` (e.g. `s.canonical_name = 'python'`) rather than `ILIKE` on `skills.name`; common alternative spellings are mapped in `skill_aliases` (lowercase `alias` → `canonical_name`), and for any other spelling use the usual lowercase name without a version.
      - Use explicit `JOIN` statements when retrieving data across multiple tables.  
    
 4. **match_job_description**
@@ -127,6 +133,10 @@ Below are the available tools and the key points for using them:
 5. **ask_human_feedback**
    - Use this tool to ask clarifying questions if the user’s request is ambiguous.
 
+# DATABASE SCHEMA
+
+{schema}
+
 # INSTRUCTIONS
 
 - Follow the step-by-step plan you created. 
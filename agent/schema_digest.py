@@ -0,0 +1,96 @@
+import asyncio
+import os
+from collections import deque
+
+import structlog
+from alembic.script import ScriptDirectory
+from sqlalchemy import MetaData, Table
+from sqlalchemy.dialects import postgresql
+
+import models  # noqa: F401, registers every table on Base.metadata
+from core.config import settings
+from database import Base
+from utils.cache import DiskCache
+
+logger = structlog.stdlib.get_logger()
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic")
+# Join paths in the digest start from this table
+ROOT_TABLE = "candidates"
+# Bump when the digest's layout changes, so cached digests are rebuilt
+DIGEST_FORMAT = 1
+
+_digest_cache = DiskCache(os.path.join(settings.CACHE_DIR, "schema_digest"))
+
+
+def _column_digest(column) -> str:
+    type_name = column.type.compile(dialect=postgresql.dialect()).lower()
+    parts = [column.name, type_name.replace("timestamp with time zone", "timestamptz")]
+    if column.primary_key:
+        parts.append("PK")
+    for foreign_key in column.foreign_keys:
+        parts.append(f"→ {foreign_key.target_fullname}")
+    if column.unique:
+        parts.append("unique")
+    if column.nullable and not column.primary_key:
+        parts.append("null")
+    return " ".join(parts)
+
+
+def _join_paths(metadata: MetaData, root: str) -> dict[str, list[str]]:
+    """The shortest chain of FK joins from `root` to every table it reaches, as JOIN clauses."""
+    edges: dict[str, list[tuple[str, str]]] = {name: [] for name in metadata.tables}
+    for table in metadata.tables.values():
+        for foreign_key in table.foreign_keys:
+            child = f"{table.name}.{foreign_key.parent.name}"
+            parent = foreign_key.target_fullname
+            edges[table.name].append((foreign_key.column.table.name, f"{parent} = {child}"))
+            edges[foreign_key.column.table.name].append((table.name, f"{child} = {parent}"))
+
+    paths = {root: []}
+    queue = deque([root])
+    while queue:
+        name = queue.popleft()
+        for neighbour, condition in sorted(edges[name]):
+            if neighbour in paths:
+                continue
+            paths[neighbour] = paths[name] + [f"JOIN {neighbour} ON {condition}"]
+            queue.append(neighbour)
+    del paths[root]
+    return paths
+
+
+def build_schema_digest(metadata: MetaData = Base.metadata, root: str = ROOT_TABLE) -> str:
+    """
+    A compact description of every table for the agent prompts: columns with
+    types, keys and nullability, then how to join each table to `root`.
+    """
+    tables: list[Table] = sorted(metadata.tables.values(), key=lambda table: table.name)
+    lines = ["Tables (column type, PK, → foreign key, unique, null = nullable):"]
+    for table in tables:
+        lines.append(f"- {table.name}: " + ", ".join(_column_digest(column) for column in table.columns))
+
+    lines.append("")
+    lines.append(f"Join paths from {root}:")
+    for name, joins in sorted(_join_paths(metadata, root).items()):
+        lines.append(f"- {name}: FROM {root} " + " ".join(joins))
+    return "\n".join(lines)
+
+
+def alembic_head() -> str:
+    return ScriptDirectory(ALEMBIC_DIR).get_current_head() or "base"
+
+
+async def load_schema_digest() -> str:
+    """
+    The digest for the current alembic head revision, from the cache when it
+    was already built for this revision.
+    """
+    revision = await asyncio.to_thread(alembic_head)
+    key = f"v{DIGEST_FORMAT}-{revision}"
+    digest = await _digest_cache.get(key)
+    if digest is None:
+        digest = build_schema_digest()
+        await _digest_cache.set(key, digest)
+        await logger.info("Schema digest built", revision=revision, chars=len(digest))
+    return digest
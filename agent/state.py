@@ -7,4 +7,5 @@ class AgentState(TypedDict):
     requires_db_query: bool = False
     num_feedback_requests: int = 0
     is_good_answer: bool = False
+    judge_accepted: bool = False  # is_good_answer came from the judge, not from running out of feedback rounds
     messages: Annotated[Sequence[BaseMessage], add_messages]
\ No newline at end of file
@@ -7,35 +7,128 @@ from langchain_core.tools import tool
 
 # from agent.calls_schema import SearchPapersInput
 # from services.core_api_service import CoreAPIWrapper
-from langchain_community.utilities import SQLDatabase
-from core.config import settings
-from services.documents import document_processor
-# Initialize the database
-db = SQLDatabase.from_uri(settings.SYNC_DATABASE_URI)
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.schema import CreateTable
+
+import models  # noqa: F401, registers every table on Base.metadata
+from database import Base, sessionmanager
+from services.documents import get_document_processor
+from services.query_cache import agent_query_cache, is_cacheable, normalize_sql
+
+# Long values (resume content) are cut in results, like SQLDatabase.run does
+MAX_STRING_LENGTH = 300
+SAMPLE_ROWS = 3
+
+
+def _truncate(value, length: int = MAX_STRING_LENGTH):
+    if not isinstance(value, str) or len(value) <= length:
+        return value
+    return value[: length - 3].rsplit(" ", 1)[0] + "..."
+
+
+async def _run_query(query: str, primary: bool = False) -> str:
+    async with sessionmanager.read_session(primary=primary) as db_session:
+        result = await db_session.execute(text(query))
+        if not result.returns_rows:
+            return ""
+        rows = [tuple(_truncate(value) for value in row) for row in result]
+    return str(rows) if rows else ""
+
+
+async def run_read_query(query: str, primary: bool = False) -> str:
+    """
+    Run the agent's SQL on the shared asyncpg pool, on the read replica when
+    there is one unless `primary` is set. A replica connection lost mid-query
+    is retried on the primary; SQL errors are returned as text for the model
+    to correct.
+    """
+    try:
+        try:
+            return await _run_query(query, primary=primary)
+        except DBAPIError as e:
+            if primary or not e.connection_invalidated or not sessionmanager.replica_available():
+                raise
+            sessionmanager.mark_replica_down()
+            return await _run_query(query, primary=True)
+    except SQLAlchemyError as e:
+        return f"Error: {e}"
+
+
+async def run_cached_query(query: str) -> str:
+    """
+    run_read_query behind the agent query cache; only successful, deterministic
+    SELECTs are cached. Misses read the primary: a lagging replica could return
+    rows from before the write that bumped the version they'd be stored under.
+    """
+    normalized = normalize_sql(query)
+    if agent_query_cache is None or not is_cacheable(normalized):
+        return await run_read_query(query)
+    cached, version = await agent_query_cache.get(normalized)
+    if cached is not None:
+        return cached
+    result = await run_read_query(query, primary=True)
+    if not result.startswith("Error:"):
+        await agent_query_cache.set(normalized, result, version)
+    return result
+
+
+@tool("sql_db_list_tables")
+async def list_tables_tool(tool_input: str = "") -> str:
+    """Input is an empty string, output is a comma-separated list of tables in the database."""
+    return ", ".join(sorted(Base.metadata.tables))
+
+
+@tool("sql_db_schema")
+async def get_schema_tool(table_names: str) -> str:
+    """
+    Input to this tool is a comma-separated list of tables, output is the schema and sample rows for those tables.
+    Be sure that the tables actually exist by calling sql_db_list_tables first!
+    Example Input: table1, table2, table3
+    """
+    names = [name.strip() for name in table_names.split(",") if name.strip()]
+    unknown = [name for name in names if name not in Base.metadata.tables]
+    if unknown:
+        return f"Error: table_names {set(unknown)} not found in database"
+
+    schemas = []
+    async with sessionmanager.read_session() as db_session:
+        for name in names:
+            table = Base.metadata.tables[name]
+            ddl = str(CreateTable(table).compile(dialect=postgresql.dialect())).strip()
+            # long text such as candidates.content is cut in the samples
+            result = await db_session.execute(select(table).limit(SAMPLE_ROWS))
+            samples = "\n".join(
+                "\t".join(str(_truncate(value, 100)) for value in row) for row in result
+            )
+            columns = "\t".join(column.name for column in table.columns)
+            schemas.append(f"{ddl}\n\n/*\n{SAMPLE_ROWS} rows from {name} table:\n{columns}\n{samples}\n*/")
+    return "\n\n".join(schemas)
+
 
 @tool("db-query-tool")
-def db_query_tool(query: str) -> str:
+async def db_query_tool(query: str) -> str:
     """
     Execute a SQL query against the database and get back the result.
     If the query is not correct, an error message will be returned.
     If an error is returned, rewrite the query, check the query, and try again.
     """
-    result = db.run_no_throw(query)
+    result = await run_cached_query(query)
     if not result:
         return "Error: Query failed. Please rewrite your query and try again."
     return result
 
 @tool("match-job-description")
-def match_job_description(job_description: str) -> str:
+async def match_job_description(job_description: str) -> str:
     """    
     Match the job description with the resume and return the result.
     Use this tool if the user is asking for a match for a job posting.
     This tool returns the top 4 most relevant resumes, with a unique identifier for each resume.
     """
-    return document_processor.retrieve_docs_serialized(job_description)
+    return await get_document_processor().aretrieve_docs_serialized(job_description)
 
 @tool("ask-human-feedback")
 def ask_human_feedback(question: str) -> str:
     """Ask for human feedback. You should call this tool when encountering unexpected errors."""
     return input(question)
-
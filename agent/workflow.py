@@ -1,9 +1,12 @@
+import asyncio
 import json
+import re
 from collections.abc import AsyncGenerator
 
 import structlog
-from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langgraph.checkpoint.memory import InMemorySaver
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
@@ -17,10 +20,19 @@ from agent.prompts import (
     judge_prompt,
     planning_prompt,
 )
+from agent.schema_digest import build_schema_digest
 from agent.state import AgentState
-from agent.tools import db, db_query_tool, ask_human_feedback, match_job_description
+from agent.tools import (
+    ask_human_feedback,
+    db_query_tool,
+    get_schema_tool,
+    list_tables_tool,
+    match_job_description,
+)
 from core.config import settings
-from schema.agent import StreamInput
+from schema.agent import StreamInput, UserInput
+from services.answer_cache import AnswerLookup, SemanticAnswerCache
+from services.query_cache import track_run_stats
 from utils.helpers import (
     convert_message_content_to_string,
     format_tools_description,
@@ -28,7 +40,6 @@ from utils.helpers import (
     parse_input,
     remove_tool_calls,
 )
-from langchain_community.agent_toolkits import SQLDatabaseToolkit
 
 
 logger = structlog.get_logger(__name__)
@@ -37,19 +48,35 @@ logger = structlog.get_logger(__name__)
 class CandidatesAgent:
     """Encapsulates LangGraph agent logic."""
 
-    def __init__(self):
+    def __init__(self, schema_digest: str | None = None):
         self.base_llm = ChatOpenAI(
             model="gpt-4o-mini", temperature=0.0, api_key=settings.OPENAI_API_KEY,streaming=True
         )
-        self.db_toolkit = SQLDatabaseToolkit(db=db, llm=self.base_llm)
-        self.db_tools = self.db_toolkit.get_tools()
-
-        self.list_tables_tool = next(tool for tool in self.db_tools if tool.name == "sql_db_list_tables")
-        self.get_schema_tool = next(tool for tool in self.db_tools if tool.name == "sql_db_schema")
-
-
-        self.tools = [self.list_tables_tool, self.get_schema_tool, db_query_tool,match_job_description, ask_human_feedback]
+        # Every node and tool is async, so concurrent sessions share the event
+        # loop instead of each step taking a thread from the executor
+        self.tools = [list_tables_tool, get_schema_tool, db_query_tool, match_job_description, ask_human_feedback]
         self.tools_dict = {tool.name: tool for tool in self.tools}
+        # The schema is in the prompts, so the model doesn't spend tool round
+        # trips listing tables and reading their schemas on every question
+        self.schema_digest = schema_digest or build_schema_digest()
+        self.planning_prompt = planning_prompt.format(
+            tools=format_tools_description(self.tools), schema=self.schema_digest
+        )
+        self.agent_prompt = agent_prompt.format(schema=self.schema_digest)
+        # Shared by every session in this process, so one busy turn can't flood
+        # the database pool or Pinecone with tool calls
+        self.tool_semaphore = asyncio.Semaphore(settings.AGENT_TOOL_MAX_CONCURRENCY)
+        self.tool_timeout = settings.AGENT_TOOL_TIMEOUT
+        self.answer_cache = (
+            SemanticAnswerCache(
+                OpenAIEmbeddings(api_key=settings.OPENAI_API_KEY, model=settings.EMBEDDINGS_MODEL),
+                threshold=settings.AGENT_ANSWER_CACHE_THRESHOLD,
+                ttl=settings.AGENT_ANSWER_CACHE_TTL,
+                max_entries=settings.AGENT_ANSWER_CACHE_MAX_ENTRIES,
+            )
+            if settings.AGENT_ANSWER_CACHE_ENABLED and settings.AGENT_ANSWER_CACHE_MAX_ENTRIES > 0
+            else None
+        )
         self.decision_making_llm = self.base_llm.with_structured_output(
             DecisionMakingOutput
         )
@@ -86,10 +113,10 @@ class CandidatesAgent:
         return workflow
 
     # Decision making node
-    def decision_making_node(self, state: AgentState):
+    async def decision_making_node(self, state: AgentState):
         """Entry point of the workflow. Based on the user query, the model can either respond directly or perform a db_query or use another tool, routing the workflow to the planning node"""
         system_prompt = SystemMessage(content=decision_making_prompt)
-        response: DecisionMakingOutput = self.decision_making_llm.invoke(
+        response: DecisionMakingOutput = await self.decision_making_llm.ainvoke(
             [system_prompt] + state["messages"]
         )
         output = {"requires_db_query": response.requires_db_query}
@@ -103,34 +130,52 @@ class CandidatesAgent:
         return "planning" if state["requires_db_query"] else "end"
 
     # Planning node
-    def planning_node(self, state: AgentState):
+    async def planning_node(self, state: AgentState):
         """Planning node that creates a step by step plan to answer the user query."""
-        system_prompt = SystemMessage(
-            content=planning_prompt.format(tools=format_tools_description(self.tools))
-        )
-        response = self.base_llm.invoke([system_prompt] + state["messages"])
+        system_prompt = SystemMessage(content=self.planning_prompt)
+        response = await self.base_llm.ainvoke([system_prompt] + state["messages"])
         return {"messages": [response]}
 
     # Tool call node
-    def tools_node(self, state: AgentState):
-        """Tool call node that executes the tools based on the plan."""
-        outputs = []
-        for tool_call in state["messages"][-1].tool_calls:
-            tool_result = self.tools_dict[tool_call["name"]].invoke(tool_call["args"])
-            outputs.append(
-                ToolMessage(
-                    content=json.dumps(tool_result),
-                    name=tool_call["name"],
-                    tool_call_id=tool_call["id"],
-                )
-            )
-        return {"messages": outputs}
+    async def tools_node(self, state: AgentState):
+        """Tool call node that executes the tools based on the plan, all calls of the turn at once."""
+        outputs = await asyncio.gather(
+            *(self._run_tool(tool_call) for tool_call in state["messages"][-1].tool_calls)
+        )
+        return {"messages": list(outputs)}
+
+    async def _run_tool(self, tool_call) -> ToolMessage:
+        """Run one tool call. Failures and timeouts become that call's ToolMessage so the rest of the turn still lands."""
+        name = tool_call["name"]
+        tool = self.tools_dict.get(name)
+        status = "success"
+        if tool is None:
+            tool_result = f"Error: unknown tool {name}. Available tools: {', '.join(self.tools_dict)}"
+            status = "error"
+        else:
+            try:
+                async with self.tool_semaphore:
+                    tool_result = await asyncio.wait_for(tool.ainvoke(tool_call["args"]), timeout=self.tool_timeout)
+            except asyncio.TimeoutError:
+                await logger.warning("Tool call timed out", tool=name, timeout=self.tool_timeout)
+                tool_result = f"Error: {name} timed out after {self.tool_timeout:g}s. Try a simpler or narrower request."
+                status = "error"
+            except Exception as e:
+                await logger.warning("Tool call failed", tool=name, error=str(e))
+                tool_result = f"Error: {name} failed: {e}"
+                status = "error"
+        return ToolMessage(
+            content=json.dumps(tool_result),
+            name=name,
+            tool_call_id=tool_call["id"],
+            status=status,
+        )
 
     # Agent call node
-    def agent_node(self, state: AgentState):
+    async def agent_node(self, state: AgentState):
         """Agent call node that uses the LLM with tools to answer the user query."""
-        system_prompt = SystemMessage(content=agent_prompt)
-        response = self.agent_llm.invoke([system_prompt] + state["messages"])
+        system_prompt = SystemMessage(content=self.agent_prompt)
+        response = await self.agent_llm.ainvoke([system_prompt] + state["messages"])
         return {"messages": [response]}
 
     # Should continue function
@@ -139,18 +184,19 @@ class CandidatesAgent:
         return "continue" if state["messages"][-1].tool_calls else "end"
 
     # Judge node
-    def judge_node(self, state: AgentState):
+    async def judge_node(self, state: AgentState):
         """Node to let the LLM judge the quality of its own final answer."""
         # End execution if the LLM failed to provide a good answer twice.
         num_feedback_requests = state.get("num_feedback_requests", 0)
         if num_feedback_requests >= 2:
-            return {"is_good_answer": True}
+            return {"is_good_answer": True, "judge_accepted": False}
         system_prompt = SystemMessage(content=judge_prompt)
-        response: JudgeOutput = self.judge_llm.invoke(
+        response: JudgeOutput = await self.judge_llm.ainvoke(
             [system_prompt] + state["messages"]
         )
         output = {
             "is_good_answer": response.is_good_answer,
+            "judge_accepted": response.is_good_answer,
             "num_feedback_requests": num_feedback_requests + 1,
         }
         if response.feedback:
@@ -162,6 +208,51 @@ class CandidatesAgent:
         """Router to end the workflow or improve the answer."""
         return "end" if state["is_good_answer"] else "planning"
 
+    async def acached_answer(
+        self, user_input: UserInput, config: RunnableConfig
+    ) -> tuple[AIMessage | None, AnswerLookup | None]:
+        """
+        A final answer given earlier to a similar question, and the lookup to
+        remember a fresh answer with on a miss. Questions that continue a thread
+        with history depend on that context, so they bypass the cache.
+        """
+        if self.answer_cache is None:
+            return None, None
+        if user_input.thread_id:
+            state = await self.compiled_agent.aget_state(config)
+            if state.values.get("messages"):
+                return None, None
+
+        lookup = await self.answer_cache.lookup(user_input.message)
+        if lookup.hit is None:
+            return None, lookup
+        answer = AIMessage(
+            content=lookup.hit.answer,
+            response_metadata={
+                "answer_cache": {"similarity": lookup.hit.similarity, "question": lookup.hit.question}
+            },
+        )
+        if user_input.thread_id:
+            # Record the exchange, so a follow-up on this thread has it as context
+            await self.compiled_agent.aupdate_state(
+                config,
+                {"messages": [HumanMessage(content=user_input.message), answer], "is_good_answer": True},
+                as_node="judge",
+            )
+        return answer, lookup
+
+    def remember_answer(self, lookup: AnswerLookup | None, user_input: UserInput, values: dict):
+        """
+        Keep the final answer of a run that missed the cache, if the judge
+        accepted it rather than letting it through after two rejections.
+        """
+        if lookup is None or not values.get("judge_accepted"):
+            return
+        message = values["messages"][-1] if values.get("messages") else None
+        if not isinstance(message, AIMessage) or message.tool_calls or not message.content:
+            return
+        self.answer_cache.store(lookup, user_input.message, convert_message_content_to_string(message.content))
+
     async def message_generator(
         self,
         user_input: StreamInput,
@@ -173,6 +264,19 @@ class CandidatesAgent:
         """
         agent: CompiledStateGraph = self.compiled_agent
         kwargs, run_id = parse_input(user_input)
+        query_cache_stats = track_run_stats()
+
+        cached, lookup = await self.acached_answer(user_input, kwargs["config"])
+        if cached is not None:
+            # Replay the answer as tokens, so clients render it like a fresh one
+            for token in re.findall(r"\S+\s*|\s+", cached.content):
+                yield f"data: {json.dumps({'event_name': 'answer_cache', 'type': 'token', 'content': token})}\n\n"
+            chat_message = langchain_to_chat_message(cached)
+            chat_message.run_id = str(run_id)
+            yield f"data: {json.dumps({'event_name': 'answer_cache', 'type': 'message', 'content': chat_message.model_dump()})}\n\n"
+            await logger.info("Agent answer served from cache", run_id=str(run_id), similarity=lookup.hit.similarity)
+            yield "data: [DONE]\n\n"
+            return
 
         # Process streamed events from the graph and yield messages over the SSE stream.
         async for event in agent.astream_events(**kwargs, version="v2"):
@@ -203,7 +307,7 @@ class CandidatesAgent:
                     chat_message = langchain_to_chat_message(message)
                     chat_message.run_id = str(run_id)
                 except Exception as e:
-                    logger.error(f"Error parsing message: {e}")
+                    await logger.error(f"Error parsing message: {e}")
                     yield f"data: {json.dumps({'event_name':event['name'], 'type': 'error', 'content': 'Unexpected error'})}\n\n"
                     continue
                 # LangGraph re-sends the input message, which feels weird, so drop it
@@ -226,4 +330,9 @@ class CandidatesAgent:
                     yield f"data: {json.dumps({'event_name':event['name'],'type': 'token', 'content': convert_message_content_to_string(content)})}\n\n"
                 continue
             yield f"data: {json.dumps({'event_name':event['name'], 'type': 'info', 'event':event['event'] })}\n\n"
+        if lookup is not None:
+            state = await agent.aget_state(kwargs["config"])
+            self.remember_answer(lookup, user_input, state.values)
+        await logger.info("Agent run finished", run_id=str(run_id), query_cache=query_cache_stats.snapshot())
+        yield f"data: {json.dumps({'event_name': 'query_cache', 'type': 'info', 'content': query_cache_stats.snapshot()})}\n\n"
         yield "data: [DONE]\n\n"
@@ -0,0 +1,137 @@
+"""skill canonical names and aliases
+
+Revision ID: e7a3c1f90b42
+Revises: d41f8c2a7b10
+Create Date: 2026-10-18 14:02:41.118305
+
+Seeds `skill_aliases`, backfills `skills.canonical_name` and merges skills
+that canonicalize to the same name into the oldest one, moving their
+candidate links over.
+
+"""
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c1f90b42'
+down_revision: Union[str, None] = 'd41f8c2a7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The normalizer and seed aliases of services/skills.py as of this revision,
+# copied so later changes to the app don't change what this migration does
+SEED_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "nextjs": "next.js",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql server",
+    "microsoft sql server": "sql server",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    "sklearn": "scikit-learn",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+    "cicd": "ci/cd",
+}
+
+_TRAILING_VERSION = re.compile(r"\s+v?\d+(\.\d+)*(\.x)?$")
+
+
+def normalize_skill_name(name: str) -> str:
+    name = unicodedata.normalize("NFKC", name).casefold()
+    name = re.sub(r"\s+", " ", name).strip(" -_,;:|*•·").rstrip(".")
+    return _TRAILING_VERSION.sub("", name) or name
+
+
+ALIASES = {normalize_skill_name(a): normalize_skill_name(c) for a, c in SEED_ALIASES.items()}
+
+
+def canonicalize(name: str) -> str:
+    normalized = normalize_skill_name(name)
+    return ALIASES.get(normalized, normalized)
+
+
+def merge_duplicate_skills() -> None:
+    conn = op.get_bind()
+    groups = defaultdict(list)
+    for skill_id, name in conn.execute(sa.text("SELECT id, name FROM skills ORDER BY id")):
+        groups[canonicalize(name)].append(skill_id)
+
+    move_links = sa.text(
+        "INSERT INTO candidate_skills (candidate_id, skill_id) "
+        "SELECT candidate_id, :keep FROM candidate_skills WHERE skill_id IN :duplicates "
+        "ON CONFLICT DO NOTHING"
+    ).bindparams(sa.bindparam("duplicates", expanding=True))
+    delete_skills = sa.text("DELETE FROM skills WHERE id IN :duplicates").bindparams(
+        sa.bindparam("duplicates", expanding=True)
+    )
+    for keep, *duplicates in groups.values():
+        if duplicates:
+            conn.execute(move_links, {"keep": keep, "duplicates": duplicates})
+            # candidate_skills rows of the duplicates go with them (ON DELETE CASCADE)
+            conn.execute(delete_skills, {"duplicates": duplicates})
+
+    if groups:
+        conn.execute(
+            sa.text("UPDATE skills SET canonical_name = :canonical_name WHERE id = :id"),
+            [{"canonical_name": name, "id": ids[0]} for name, ids in groups.items()],
+        )
+
+
+def upgrade() -> None:
+    skill_aliases = op.create_table('skill_aliases',
+    sa.Column('alias', sa.String(length=100), nullable=False),
+    sa.Column('canonical_name', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('alias')
+    )
+    op.create_index(op.f('ix_skill_aliases_canonical_name'), 'skill_aliases', ['canonical_name'], unique=False)
+    # the agent's SQL resolves spellings through this table, so it starts with the seed
+    op.bulk_insert(skill_aliases, [{"alias": alias, "canonical_name": name} for alias, name in ALIASES.items()])
+    op.add_column('skills', sa.Column('canonical_name', sa.String(length=50), nullable=True))
+
+    merge_duplicate_skills()
+
+    op.alter_column('skills', 'canonical_name', nullable=False)
+    op.create_index(op.f('ix_skills_canonical_name'), 'skills', ['canonical_name'], unique=True)
+    op.drop_constraint('skills_name_key', 'skills', type_='unique')
+    op.create_index(op.f('ix_candidate_skills_skill_id'), 'candidate_skills', ['skill_id'], unique=False)
+
+
+def downgrade() -> None:
+    # merged skills are not split again
+    op.drop_index(op.f('ix_candidate_skills_skill_id'), table_name='candidate_skills')
+    op.create_unique_constraint('skills_name_key', 'skills', ['name'])
+    op.drop_index(op.f('ix_skills_canonical_name'), table_name='skills')
+    op.drop_column('skills', 'canonical_name')
+    op.drop_index(op.f('ix_skill_aliases_canonical_name'), table_name='skill_aliases')
+    op.drop_table('skill_aliases')
@@ -4,13 +4,57 @@ from core.config import settings
 from utils.s3_client import S3Client, get_s3_client
 from typing import Annotated
 
-from database import get_db_session
+from database import get_db_session, sessionmanager
 from utils.redis import get_redis_client
-from fastapi import Depends
+from services.jobs import IngestionJobQueue
+from schema.candidates import CANDIDATE_FIELDS, CANDIDATE_RELATIONSHIPS, CandidateFieldset
+from fastapi import Depends, Header, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 DBSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
 
+
+def get_read_primary(
+    read_primary: bool = Header(
+        False, alias="X-Read-Primary", description="Read from the primary instead of the replica, e.g. right after a write"
+    ),
+) -> bool:
+    return read_primary
+
+
+# For handlers that open sessionmanager.read_session themselves, only on the
+# paths that query, since a read session holds its connection from the start
+ReadPrimaryDep = Annotated[bool, Depends(get_read_primary)]
+
+
+async def get_read_db_session(read_primary: ReadPrimaryDep):
+    async with sessionmanager.read_session(primary=read_primary) as session:
+        yield session
+
+
+ReadDBSessionDep = Annotated[AsyncSession, Depends(get_read_db_session)]
+
 RedisDep = Annotated[Redis, Depends(get_redis_client)]
 
 S3Dep = Annotated[S3Client, Depends(get_s3_client)]
+
+
+def get_ingestion_queue(request: Request) -> IngestionJobQueue:
+    return request.app.state.ingestion_queue
+
+
+IngestionQueueDep = Annotated[IngestionJobQueue, Depends(get_ingestion_queue)]
+
+
+def get_candidate_fieldset(
+    fields: str | None = Query(
+        None, description=f"Comma-separated candidate fields to return: {', '.join(CANDIDATE_FIELDS)}"
+    ),
+    include: str | None = Query(
+        None, description=f"Comma-separated relationships to return: {', '.join(CANDIDATE_RELATIONSHIPS)}"
+    ),
+) -> CandidateFieldset | None:
+    return CandidateFieldset.parse(fields, include)
+
+
+CandidateFieldsetDep = Annotated[CandidateFieldset | None, Depends(get_candidate_fieldset)]
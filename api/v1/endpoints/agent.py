@@ -5,6 +5,7 @@ from fastapi.responses import StreamingResponse
 from agent.workflow import CandidatesAgent 
 from schema.agent import ChatMessage, StreamInput, UserInput, sse_response_example
 from schema.responses import ResponseBase, create_response
+from services.query_cache import track_run_stats
 from utils.helpers import langchain_to_chat_message, parse_input
 
 logger = structlog.stdlib.get_logger()
@@ -19,10 +20,22 @@ async def research_query(
 ) -> ResponseBase[ChatMessage]:
     kwargs, run_id = parse_input(body)
     graph: CandidatesAgent= request.app.state.graph
+    query_cache_stats = track_run_stats()
+    cached, lookup = await graph.acached_answer(body, kwargs["config"])
+    if cached is not None:
+        output = langchain_to_chat_message(cached)
+        output.run_id = str(run_id)
+        await logger.info("Agent answer served from cache", run_id=str(run_id), similarity=lookup.hit.similarity)
+        return create_response(output, meta={"answer_cache": {"hit": True, "similarity": lookup.hit.similarity}})
+
     response = await graph.compiled_agent.ainvoke(**kwargs)
+    graph.remember_answer(lookup, body, response)
     output = langchain_to_chat_message(response["messages"][-1])
     output.run_id = str(run_id)
-    return create_response(output)
+    await logger.info("Agent run finished", run_id=str(run_id), query_cache=query_cache_stats.snapshot())
+    return create_response(
+        output, meta={"query_cache": query_cache_stats.snapshot(), "answer_cache": {"hit": False}}
+    )
 
 
 @router.post(
@@ -1,95 +1,170 @@
+import json
 import os
+import time
+from typing import Awaitable, Callable, List
+
 import structlog
-from fastapi import APIRouter, Depends, Request, HTTPException, File, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, HTTPException, File, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi_limiter.depends import RateLimiter
-from api.deps import DBSessionDep
-from schema.candidates import CandidateCreate, CandidateUpdate, CandidateResponse
-from schema.certificates import CertificationCreate 
-from schema.education import EducationCreate 
-from schema.experience import ExperienceCreate 
-from schema.skills import SkillCreate 
-from schema.projects import ProjectCreate 
-from schema.responses import ResponseBase, ResponseBasePaginated, create_response, create_paginated_response
+from api.deps import CandidateFieldsetDep, DBSessionDep, IngestionQueueDep, ReadDBSessionDep, ReadPrimaryDep
+from core.config import settings
+from schema.candidates import CandidateCreate, CandidateFieldset, CandidateUpdate, CandidateResponse
+from schema.jobs import IngestionJob, ndjson_response_example
+from schema.responses import CountMode, ResponseBase, ResponseBasePaginated, create_response, create_paginated_response
+from database import sessionmanager
 from crud.candidates import (
     create_candidate,
     get_candidate,
     update_candidate,
     get_candidate_by_email,
     get_candidates_paginated,
+    get_candidates_keyset,
     get_candidate_by_embeddings_namespace,
-    get_candidates_count,
-)
-from crud.sections import (
-    create_certification,
-    create_education,
-    create_experience,
-    create_skill,
-    create_project,
+    get_candidates_total,
 )
-from services.documents import document_processor
+from models import Candidate
+from services.candidate_cache import CachedCandidate, candidate_cache
+from services.ingestion import ALLOWED_EXTENSIONS, expand_uploads, ingest_many
+from services.query_cache import bump_data_version
+from utils.pagination import decode_cursor, encode_cursor
+from utils.serialization import FastJSONResponse, raw_json, serializer_for
 
 router = APIRouter()
 logger = structlog.stdlib.get_logger()
 
+
+def candidate_response(
+    body: ResponseBase | ResponseBasePaginated,
+    fieldset: CandidateFieldset | None = None,
+    **kwargs,
+) -> FastJSONResponse:
+    """
+    Encode an envelope around ORM candidates straight to JSON, full or sparse,
+    in the same wire format the route's response_model would produce.
+    """
+    model = CandidateResponse if fieldset is None else fieldset.response_model
+    envelope = ResponseBasePaginated[model] if isinstance(body, ResponseBasePaginated) else ResponseBase[model]
+    return FastJSONResponse(serializer_for(envelope)(body), **kwargs)
+
+
+async def read_through_candidate(
+    request: Request,
+    lookup: Awaitable[tuple[CachedCandidate | None, str | None]],
+    load: Callable[[], Awaitable[Candidate | None]],
+):
+    """
+    Serve a full candidate from the cache, loading and caching it on a miss.
+    Answers 304 when the client's If-None-Match already has this version.
+
+    `load` should read the primary: filling the cache from a lagging replica
+    could store the version an update just invalidated.
+    """
+    start = time.perf_counter()
+    cached, generation = await lookup
+    outcome = "hit"
+    if cached is None:
+        outcome = "miss"
+        candidate = await load()
+        if candidate is None:
+            return create_response(None)
+        cached = await candidate_cache.set(candidate, generation)
+    candidate_cache.stats.observe(outcome, time.perf_counter() - start)
+
+    headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if cached.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    body = create_response(None).model_dump()
+    body["data"] = raw_json(cached.data)
+    return FastJSONResponse(body, headers=headers)
+
 # upload a candidate's resume
 @router.post(
     "/",
     dependencies=[Depends(RateLimiter(times=10, seconds=20))],
-    response_model=ResponseBase[CandidateResponse],
-    status_code=201,
+    response_model=ResponseBase[IngestionJob],
+    status_code=202,
 )
 async def upload_candidate_resume(
     request: Request,
-    db_session: DBSessionDep,
+    response: Response,
+    ingestion_queue: IngestionQueueDep,
     file: UploadFile = File(...),
 ):
-    allowed_extensions = [".pdf", ".docx" ]
-
     file_name = file.filename
     file_extension = os.path.splitext(file.filename)[1].lower()
-    namespace = os.urandom(10).hex()
     await logger.info(f"Uploading file {file_name} with extension {file_extension}")
-    if file_extension not in allowed_extensions:
+    if file_extension not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type. Allowed types are: {', '.join(allowed_extensions)}",
+            detail=f"Unsupported file type. Allowed types are: {', '.join(ALLOWED_EXTENSIONS)}",
+        )
+
+    job = await ingestion_queue.submit(file_name, await file.read())
+    if job.status == "succeeded":
+        # Re-uploads of an already processed file return the stored candidate's id
+        await logger.info("Duplicate upload", candidate_id=job.candidate_id, content_hash=job.content_hash)
+        response.status_code = 200
+        return create_response(job, message="Candidate already exists")
+    return create_response(job, message="Resume accepted for processing")
+
+
+# upload many resumes (or ZIP archives of resumes) at once
+@router.post(
+    "/bulk",
+    dependencies=[Depends(RateLimiter(times=2, seconds=60))],
+    response_class=StreamingResponse,
+    responses=ndjson_response_example(),
+    status_code=200,
+)
+async def bulk_upload_candidate_resumes(
+    request: Request,
+    files: List[UploadFile] = File(...),
+):
+    """
+    Process many resumes with bounded concurrency and stream one NDJSON line per
+    file as it finishes, followed by a summary line.
+
+    ZIP archives are expanded and each entry is processed as its own resume.
+    """
+    uploads = []
+    for file in files:
+        if len(uploads) >= settings.BULK_UPLOAD_MAX_FILES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many files. At most {settings.BULK_UPLOAD_MAX_FILES} resumes per request",
+            )
+        uploads.extend(
+            expand_uploads(file.filename, await file.read(), settings.BULK_UPLOAD_MAX_FILES - len(uploads))
         )
-    
-    candidate, certs, edu, exp, skills, projects, content = await document_processor.process_file_upload(file, namespace)
-
-    # Create candidate in the database
-    candidate = await create_candidate(db_session, CandidateCreate(**candidate.model_dump(),embeddings_namespace=namespace,status='active',content=content))
-    await logger.info("Candidate created", candidate_id=candidate.id)
-
-    # Add certifications
-    for cert in certs.certifications:
-        cert_in = CertificationCreate(**cert.model_dump(), candidate_id=candidate.id)
-        await create_certification(db_session, cert_in)
-    # Add educations
-    for education in edu.education_entries:
-        edu_in = EducationCreate(**education.model_dump(), candidate_id=candidate.id)
-        await create_education(db_session, edu_in)
-    # Add experiences
-    for experience in exp.experiences:
-        exp_in = ExperienceCreate(**experience.model_dump(), candidate_id=candidate.id)
-        await create_experience(db_session, exp_in)
-
-    # Add projects
-    for project in projects.projects:
-        project_in = ProjectCreate(**project.model_dump(), candidate_id=candidate.id)
-        await create_project(db_session, project_in)
-
-    # Add skills
-    for skill in skills.skills:
-        skill_in = SkillCreate(**skill.model_dump())
-        await create_skill(db_session, skill_in, candidate.id)
-    await logger.info("Candidate details created successfully", candidate_id=candidate.id)
-
-    await db_session.refresh(candidate)
-    updated_candidate = await get_candidate(db_session, candidate.id)
-    return create_response(updated_candidate, message="Candidate created successfully") 
+    await logger.info("Bulk upload", files=len(uploads))
+
+    async def progress():
+        summary = {"total": len(uploads), "created": 0, "duplicate": 0, "failed": 0, "skipped": 0}
+        async for result in ingest_many(uploads, settings.BULK_UPLOAD_CONCURRENCY):
+            summary[result["status"]] += 1
+            yield json.dumps({"type": "file", **result}) + "\n"
+        yield json.dumps({"type": "summary", **summary}) + "\n"
 
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
+
+# get the status of a resume ingestion job
+@router.get(
+    "/jobs/{job_id}",
+    dependencies=[Depends(RateLimiter(times=60, seconds=60))],
+    response_model=ResponseBase[IngestionJob],
+    status_code=200,
+)
+async def get_ingestion_job(
+    job_id: str,
+    request: Request,
+    ingestion_queue: IngestionQueueDep,
+):
+    job = await ingestion_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return create_response(job)
 
 
 # get candidates paginated
@@ -101,14 +176,33 @@ async def upload_candidate_resume(
 )
 async def get_candidates(
     request: Request,
-    db_session: DBSessionDep,
-    page: int = 1,
-    size: int = 10,
+    db_session: ReadDBSessionDep,
+    fieldset: CandidateFieldsetDep,
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1),
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page; takes precedence over `page`"),
+    count: CountMode | None = Query(
+        None, description="How `total` is computed; defaults to `none` with a cursor and to the configured mode otherwise"
+    ),
 ):
     await logger.info("Getting candidates paginated")
-    total = await get_candidates_count(db_session)
-    candidates = await get_candidates_paginated(db_session, page, size)
-    return create_paginated_response(candidates, page, size, total)
+    # pages are narrow unless asked otherwise: ?fields=content and ?include= opt in
+    fieldset = fieldset or CandidateFieldset.summary()
+    if cursor is not None:
+        candidates = await get_candidates_keyset(db_session, size, decode_cursor(cursor), fieldset)
+        page = None
+        count = count or "none"
+    else:
+        candidates = await get_candidates_paginated(db_session, page, size, fieldset)
+    count = count or settings.PAGINATION_COUNT_MODE
+    total = await get_candidates_total(db_session, count)
+    next_cursor = None
+    if len(candidates) == size:
+        next_cursor = encode_cursor(candidates[-1].created_at, candidates[-1].id)
+    return candidate_response(
+        create_paginated_response(candidates, page, size, total, meta={"count": count}, next_cursor=next_cursor),
+        fieldset,
+    )
 
 
 # get candidate by id
@@ -122,10 +216,18 @@ async def get_candidate_by_id(
     candidate_id: int,
     request: Request,
     db_session: DBSessionDep,
+    read_primary: ReadPrimaryDep,
+    fieldset: CandidateFieldsetDep,
 ):
     await logger.info("Getting candidate by id", candidate_id=candidate_id)
-    candidate = await get_candidate(db_session, candidate_id)
-    return create_response(candidate)
+    if fieldset is None and candidate_cache is not None:
+        return await read_through_candidate(
+            request, candidate_cache.get_by_id(candidate_id), lambda: get_candidate(db_session, candidate_id)
+        )
+    # opened here, so cache hits don't hold a replica connection
+    async with sessionmanager.read_session(primary=read_primary) as read_session:
+        candidate = await get_candidate(read_session, candidate_id, fieldset)
+        return candidate_response(create_response(candidate), fieldset)
 
 
 @router.put(
@@ -142,7 +244,10 @@ async def update_candidate_endpoint(
 ):
     await logger.info("Updating candidate", candidate_id=candidate_id)
     candidate = await update_candidate(db_session, candidate_id, candidate_in)
-    return create_response(candidate, message="Candidate updated successfully")
+    if candidate_cache is not None:
+        await candidate_cache.invalidate(candidate_id, candidate.email)
+    await bump_data_version()
+    return candidate_response(create_response(candidate, message="Candidate updated successfully"))
 
 
 # create candidate manually (Test)
@@ -186,7 +291,16 @@ async def get_candidate_by_email_endpoint(
     email: str,
     request: Request,
     db_session: DBSessionDep,
+    read_primary: ReadPrimaryDep,
+    fieldset: CandidateFieldsetDep,
 ):
     await logger.info("Getting candidate by email", email=email)
-    candidate = await get_candidate_by_email(db_session, email)
-    return create_response(candidate)
+    if fieldset is None and candidate_cache is not None:
+        return await read_through_candidate(
+            request, candidate_cache.get_by_email(email), lambda: get_candidate_by_email(db_session, email)
+        )
+    async with sessionmanager.read_session(primary=read_primary) as read_session:
+        candidate = await get_candidate_by_email(read_session, email, fieldset)
+        if candidate is None:
+            return create_response(candidate)
+        return candidate_response(create_response(candidate), fieldset)
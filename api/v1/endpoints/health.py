@@ -2,8 +2,10 @@ import structlog
 from fastapi import APIRouter, Depends, Request
 from fastapi_limiter.depends import RateLimiter
 
-from schema.health import HealthCheck
+from database import sessionmanager
+from schema.health import CacheHealth, DatabaseHealth, HealthCheck
 from schema.responses import ResponseBase, create_response
+from utils.cache import cache_stats
 
 router = APIRouter()
 logger = structlog.stdlib.get_logger()
@@ -19,3 +21,29 @@ async def health_check():
     res = HealthCheck(message="Hello, I am alive and well!")
     await logger.info("Someone checked the health of the API!")
     return create_response(data=res)
+
+
+@router.get(
+    "/cache",
+    dependencies=[Depends(RateLimiter(times=10, seconds=20))],
+    response_model=ResponseBase[CacheHealth],
+    status_code=200,
+)
+async def cache_health():
+    res = CacheHealth(caches={name: stats.snapshot() for name, stats in cache_stats.items()})
+    return create_response(data=res)
+
+
+@router.get(
+    "/db",
+    dependencies=[Depends(RateLimiter(times=10, seconds=20))],
+    response_model=ResponseBase[DatabaseHealth],
+    status_code=200,
+)
+async def database_health():
+    res = DatabaseHealth(
+        **sessionmanager.pool_status(),
+        statement_cache=sessionmanager.statement_cache_stats.snapshot(),
+        replica=sessionmanager.replica_status(),
+    )
+    return create_response(data=res)
@@ -0,0 +1,109 @@
+"""
+Concurrent agent sessions against fake LLMs and tools: thread-bound vs async.
+
+Runs `--sessions` conversations at once through `CandidatesAgent.compiled_agent`,
+each taking the full path (decision, planning, a db-query tool call, the final
+answer and the judge: five LLM calls and one tool call). The LLMs and the tool
+are replaced by fakes that wait `--latency` seconds, so no OpenAI tokens are
+spent and no database is needed.
+
+In `sync` mode the fakes only have a blocking implementation, so every step
+takes a thread from the event loop's default executor, as the old sync nodes
+did. In `async` mode they await instead. Sync wall time grows once sessions
+outnumber the executor's threads; async stays flat.
+
+Usage:
+    python -m benchmarks.agent_concurrency [--sessions 8 32 128 512] [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import StructuredTool
+
+from agent.calls_schema import DecisionMakingOutput, JudgeOutput
+from agent.workflow import CandidatesAgent
+
+
+def fake_runnable(respond, latency: float, mode: str) -> RunnableLambda:
+    if mode == "async":
+        async def call(messages):
+            await asyncio.sleep(latency)
+            return respond(messages)
+    else:
+        def call(messages):
+            time.sleep(latency)
+            return respond(messages)
+    return RunnableLambda(call)
+
+
+def agent_turn(messages) -> AIMessage:
+    """Call the db tool once, then answer."""
+    if isinstance(messages[-1], ToolMessage):
+        return AIMessage(content="There are 42 candidates with Python.")
+    return AIMessage(
+        content="",
+        tool_calls=[{"name": "db-query-tool", "args": {"query": "SELECT 42"}, "id": f"call_{uuid4().hex}"}],
+    )
+
+
+def fake_db_tool(latency: float, mode: str) -> StructuredTool:
+    description = "Execute a SQL query against the database and get back the result."
+    if mode == "async":
+        async def query(query: str) -> str:
+            await asyncio.sleep(latency)
+            return "[(42,)]"
+        return StructuredTool.from_function(coroutine=query, name="db-query-tool", description=description)
+
+    def query(query: str) -> str:
+        time.sleep(latency)
+        return "[(42,)]"
+    return StructuredTool.from_function(func=query, name="db-query-tool", description=description)
+
+
+def install_fakes(agent: CandidatesAgent, latency: float, mode: str):
+    agent.decision_making_llm = fake_runnable(lambda m: DecisionMakingOutput(requires_db_query=True), latency, mode)
+    agent.base_llm = fake_runnable(lambda m: AIMessage(content="1. Query the skills table."), latency, mode)
+    agent.agent_llm = fake_runnable(agent_turn, latency, mode)
+    agent.judge_llm = fake_runnable(lambda m: JudgeOutput(is_good_answer=True), latency, mode)
+    agent.tools_dict["db-query-tool"] = fake_db_tool(latency, mode)
+
+
+async def run_sessions(agent: CandidatesAgent, sessions: int) -> float:
+    async def session():
+        config = {"configurable": {"thread_id": str(uuid4())}}
+        result = await agent.compiled_agent.ainvoke({"messages": [HumanMessage("How many Python developers?")]}, config)
+        assert result["is_good_answer"]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    return time.perf_counter() - start
+
+
+async def main(sessions: list[int], latency: float):
+    threads = min(32, (os.cpu_count() or 1) + 4)
+    print(f"default executor: {threads} threads, {latency}s per LLM/tool call, 6 calls per session")
+    print(f"{'sessions':>8} {'sync':>9} {'async':>9} {'sync/s':>8} {'async/s':>8}")
+    for count in sessions:
+        timings = {}
+        for mode in ("sync", "async"):
+            agent = CandidatesAgent()
+            install_fakes(agent, latency, mode)
+            timings[mode] = await run_sessions(agent, count)
+        print(
+            f"{count:>8} {timings['sync']:>8.2f}s {timings['async']:>8.2f}s "
+            f"{count / timings['sync']:>8.1f} {count / timings['async']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[8, 32, 128, 512])
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.latency))
@@ -0,0 +1,91 @@
+"""
+Wall-clock cost of DocumentProcessor.extract_candidate_info against a fake LLM.
+
+Compares the old sequential path (six awaited calls back to back) with the
+concurrent engine. The fake LLM sleeps for a configurable latency, so no
+OpenAI tokens are spent.
+
+Usage:
+    python -m benchmarks.extraction_concurrency --latency 1.5 --resumes 5
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from schema.candidates import CandidateExtraction
+from schema.certificates import CertificationList
+from schema.education import EducationList
+from schema.experience import ExperienceList
+from schema.projects import ProjectList
+from schema.skills import SkillList
+from services.documents import get_document_processor
+
+document_processor = get_document_processor()
+
+
+class FakeStructuredLLM:
+    """Stands in for `llm.with_structured_output(schema)`, sleeping instead of calling the API."""
+
+    def __init__(self, result, latency: float, jitter: float = 0.0):
+        self.result = result
+        self.latency = latency
+        self.jitter = jitter
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        return self.result
+
+
+def install_fake_llm(latency: float, jitter: float):
+    document_processor.candidate_tool = FakeStructuredLLM(
+        CandidateExtraction(full_name="Jane Doe", email="jane@example.com"), latency, jitter
+    )
+    document_processor.cert_tool = FakeStructuredLLM(CertificationList(certifications=[]), latency, jitter)
+    document_processor.edu_tool = FakeStructuredLLM(EducationList(education_entries=[]), latency, jitter)
+    document_processor.exp_tool = FakeStructuredLLM(ExperienceList(experiences=[]), latency, jitter)
+    document_processor.skill_tool = FakeStructuredLLM(SkillList(skills=[]), latency, jitter)
+    document_processor.project_tool = FakeStructuredLLM(ProjectList(projects=[]), latency, jitter)
+
+
+async def extract_sequentially(text: str):
+    return (
+        await document_processor.use_candidate_tool(text),
+        await document_processor.use_cert_tool(text),
+        await document_processor.use_edu_tool(text),
+        await document_processor.use_exp_tool(text),
+        await document_processor.use_skill_tool(text),
+        await document_processor.use_project_tool(text),
+    )
+
+
+async def time_per_resume(extract, resumes: int) -> list[float]:
+    timings = []
+    for _ in range(resumes):
+        start = time.perf_counter()
+        await extract("Jane Doe - Software Engineer - jane@example.com")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def main(latency: float, jitter: float, resumes: int):
+    install_fake_llm(latency, jitter)
+    sequential = await time_per_resume(extract_sequentially, resumes)
+    concurrent = await time_per_resume(document_processor.extract_candidate_info, resumes)
+
+    seq_avg = sum(sequential) / len(sequential)
+    con_avg = sum(concurrent) / len(concurrent)
+    print(f"fake LLM latency: {latency:.2f}s (+ up to {jitter:.2f}s jitter), resumes: {resumes}")
+    print(f"sequential: {seq_avg:.3f}s per resume")
+    print(f"concurrent: {con_avg:.3f}s per resume")
+    print(f"speedup:    {seq_avg / con_avg:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=1.0, help="Seconds per fake LLM call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Extra random seconds per call")
+    parser.add_argument("--resumes", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.jitter, args.resumes))
@@ -0,0 +1,76 @@
+"""
+Token usage and latency of the sectioned vs unified extraction modes.
+
+Runs both modes against the real LLM configured in `.env` for every resume in
+`data/sample_cvs`, and reports input/output tokens and wall-clock latency.
+This spends OpenAI tokens.
+
+Usage:
+    python -m benchmarks.extraction_modes [--dir data/sample_cvs]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from langchain_community.callbacks import get_openai_callback
+
+from services.compaction import compact_pages
+from services.documents import get_document_processor
+
+document_processor = get_document_processor()
+
+MODES = ("sectioned", "unified")
+
+
+async def load_resume_text(path: Path) -> str:
+    loaded_docs = await document_processor.load_and_split_document(str(path))
+    return compact_pages([doc.page_content for doc in loaded_docs])
+
+
+async def measure(mode: str, text: str) -> dict:
+    document_processor.extraction_mode = mode
+    with get_openai_callback() as cb:
+        start = time.perf_counter()
+        await document_processor.extract_candidate_info(text)
+        latency = time.perf_counter() - start
+    return {
+        "input_tokens": cb.prompt_tokens,
+        "output_tokens": cb.completion_tokens,
+        "requests": cb.successful_requests,
+        "latency": latency,
+    }
+
+
+async def main(directory: Path):
+    totals = {mode: {"input_tokens": 0, "output_tokens": 0, "latency": 0.0} for mode in MODES}
+    paths = sorted(p for p in directory.iterdir() if p.suffix.lower() in (".pdf", ".docx"))
+
+    print(f"{'file':<45} {'mode':<10} {'requests':>8} {'in tok':>8} {'out tok':>8} {'latency':>8}")
+    for path in paths:
+        text = await load_resume_text(path)
+        for mode in MODES:
+            result = await measure(mode, text)
+            for key in totals[mode]:
+                totals[mode][key] += result[key]
+            print(
+                f"{path.name[:45]:<45} {mode:<10} {result['requests']:>8} "
+                f"{result['input_tokens']:>8} {result['output_tokens']:>8} {result['latency']:>7.2f}s"
+            )
+
+    print()
+    for mode in MODES:
+        t = totals[mode]
+        n = len(paths) or 1
+        print(
+            f"{mode:<10} avg per resume: {t['input_tokens'] / n:.0f} input tokens, "
+            f"{t['output_tokens'] / n:.0f} output tokens, {t['latency'] / n:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=Path("data/sample_cvs"))
+    args = parser.parse_args()
+    asyncio.run(main(args.dir))
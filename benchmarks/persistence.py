@@ -0,0 +1,140 @@
+"""
+Per-upload DB time of persisting an extracted resume: per-row vs single transaction.
+
+Writes `--uploads` synthetic resumes (a candidate with a few rows in every
+section) through the old per-row `crud/sections.py` path, where every row is
+its own commit, and through `create_candidate_with_sections`. Reports the mean
+and p95 time per upload and the number of SQL statements each path sends.
+The benchmark candidates are deleted afterwards.
+
+Needs a local Postgres with the schema migrated (`alembic upgrade head`):
+
+Usage:
+    python -m benchmarks.persistence [--uploads 50] [--dsn postgresql+asyncpg://...]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.config import settings
+from crud.candidates import create_candidate, create_candidate_with_sections
+from crud.sections import (
+    create_certification,
+    create_education,
+    create_experience,
+    create_project,
+    create_skill,
+)
+from models import Candidate
+from schema.candidates import CandidateCreate
+from schema.certificates import CertificationBase, CertificationCreate
+from schema.education import EducationBase, EducationCreate
+from schema.experience import ExperienceBase, ExperienceCreate
+from schema.projects import ProjectBase, ProjectCreate
+from schema.skills import SkillCreate
+
+SKILLS = ["Python", "SQL", "Docker", "Kubernetes", "FastAPI", "PostgreSQL", "Redis", "AWS", "Git", "Leadership"]
+
+
+def make_resume(run_id: str, index: int) -> dict:
+    return {
+        "candidate": CandidateCreate(
+            email=f"b{run_id}-{index}@example.com",
+            full_name=f"Bench Candidate {index}",
+            country="Egypt",
+            status="active",
+            content="lorem ipsum " * 200,
+        ),
+        "certifications": [
+            CertificationBase(certification_name=f"Cert {i}", issuing_organization="Org") for i in range(3)
+        ],
+        "educations": [EducationBase(institution=f"University {i}", degree="BSc") for i in range(2)],
+        "experiences": [
+            ExperienceBase(company_name=f"Company {i}", role="Engineer", description="did things " * 30)
+            for i in range(5)
+        ],
+        "projects": [ProjectBase(project_name=f"Project {i}", description="built things " * 20) for i in range(4)],
+        "skills": [SkillCreate(name=name, category="Technical") for name in SKILLS],
+    }
+
+
+async def per_row(db_session, resume: dict) -> int:
+    candidate = await create_candidate(db_session, resume["candidate"])
+    for cert in resume["certifications"]:
+        await create_certification(db_session, CertificationCreate(**cert.model_dump(), candidate_id=candidate.id))
+    for education in resume["educations"]:
+        await create_education(db_session, EducationCreate(**education.model_dump(), candidate_id=candidate.id))
+    for experience in resume["experiences"]:
+        await create_experience(db_session, ExperienceCreate(**experience.model_dump(), candidate_id=candidate.id))
+    for project in resume["projects"]:
+        await create_project(db_session, ProjectCreate(**project.model_dump(), candidate_id=candidate.id))
+    for skill in resume["skills"]:
+        await create_skill(db_session, skill, candidate.id)
+    return candidate.id
+
+
+async def single_transaction(db_session, resume: dict) -> int:
+    candidate = await create_candidate_with_sections(
+        db_session,
+        resume["candidate"],
+        certifications=resume["certifications"],
+        educations=resume["educations"],
+        experiences=resume["experiences"],
+        projects=resume["projects"],
+        skills=resume["skills"],
+    )
+    return candidate.id
+
+
+async def run(name: str, write, sessionmaker, counter: list[int], uploads: int) -> list[int]:
+    run_id = uuid.uuid4().hex[:8]
+    timings, candidate_ids = [], []
+    counter[0] = 0
+    for index in range(uploads):
+        resume = make_resume(run_id, index)
+        async with sessionmaker() as db_session:
+            start = time.perf_counter()
+            candidate_ids.append(await write(db_session, resume))
+            timings.append(time.perf_counter() - start)
+    timings_ms = sorted(t * 1000 for t in timings)
+    p95 = timings_ms[min(len(timings_ms) - 1, int(len(timings_ms) * 0.95))]
+    print(
+        f"{name:<20} mean {statistics.mean(timings_ms):7.2f}ms  p95 {p95:7.2f}ms  "
+        f"{counter[0] / uploads:6.1f} statements/upload"
+    )
+    return candidate_ids
+
+
+async def main(dsn: str, uploads: int):
+    engine = create_async_engine(dsn)
+    sessionmaker = async_sessionmaker(bind=engine, expire_on_commit=False)
+    counter = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        counter[0] += 1
+
+    candidate_ids = []
+    try:
+        print(f"{uploads} uploads, {len(SKILLS)} skills and 14 section rows each")
+        candidate_ids += await run("per-row commits", per_row, sessionmaker, counter, uploads)
+        candidate_ids += await run("single transaction", single_transaction, sessionmaker, counter, uploads)
+    finally:
+        async with sessionmaker() as db_session:
+            await db_session.execute(delete(Candidate).where(Candidate.id.in_(candidate_ids)))
+            await db_session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=settings.DATABASE_URI)
+    parser.add_argument("--uploads", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.dsn, args.uploads))
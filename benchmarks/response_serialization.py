@@ -0,0 +1,105 @@
+"""
+Serialization cost of candidate list pages: pydantic + json vs the orjson plan.
+
+Builds pages of 10, 100 and 1000 ORM-like candidates, each with a few
+educations, experiences, projects, certifications and skills. The default path
+is what FastAPI does with a response_model: validate the envelope from
+attributes, dump it in JSON mode and encode it with json.dumps. The fast path
+is `utils.serialization.serializer_for` plus orjson. Both outputs are checked
+to be byte-for-byte identical before timing.
+
+Usage:
+    python -m benchmarks.response_serialization [--repeats 20]
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from schema.candidates import CandidateResponse
+from schema.responses import ResponseBasePaginated, create_paginated_response
+from utils.serialization import dumps, serializer_for
+
+PAGE_SIZES = (10, 100, 1000)
+
+
+def make_candidate(i: int) -> SimpleNamespace:
+    now = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc) + timedelta(seconds=i, microseconds=i * 7)
+    return SimpleNamespace(
+        id=i,
+        email=f"candidate{i}@example.com",
+        full_name=f"Candidate Ünïcode {i}",
+        country="Egypt",
+        location="Cairo",
+        phone="+20 100 000 0000",
+        status="active",
+        resume_url=None,
+        embeddings_namespace=f"{i:020x}",
+        content="Senior engineer with a decade of experience. " * 40,
+        hired=i % 3 == 0,
+        created_at=now,
+        updated_at=now,
+        educations=[
+            SimpleNamespace(institution="Cairo University", degree="BSc", major="CS", start_date="2010", end_date="2014")
+            for _ in range(2)
+        ],
+        experiences=[
+            SimpleNamespace(
+                company_name=f"Company {j}", role="Engineer", start_date="2015", end_date=None,
+                description="Built and operated services. " * 10,
+            )
+            for j in range(4)
+        ],
+        projects=[
+            SimpleNamespace(project_name=f"Project {j}", description="A project. " * 8, technologies_used="Python", link=None)
+            for j in range(3)
+        ],
+        certifications=[
+            SimpleNamespace(certification_name="AWS SA", issuing_organization="AWS", issue_date="2020", expiration_date=None)
+        ],
+        skills=[SimpleNamespace(name=name, category="Technical") for name in ("Python", "SQL", "Docker", "AWS", "Go")],
+    )
+
+
+def default_path(adapter: TypeAdapter, envelope) -> bytes:
+    validated = adapter.validate_python(envelope, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(serialize, envelope) -> bytes:
+    return dumps(serialize(envelope))
+
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main(repeats: int):
+    model = ResponseBasePaginated[CandidateResponse]
+    adapter = TypeAdapter(model)
+    serialize = serializer_for(model)
+
+    print(f"{'page size':>9} {'default':>10} {'fast':>10} {'speedup':>8}")
+    for size in PAGE_SIZES:
+        envelope = create_paginated_response([make_candidate(i) for i in range(size)], 1, size, 10_000)
+        expected = default_path(adapter, envelope)
+        if fast_path(serialize, envelope) != expected:
+            raise SystemExit(f"outputs differ for a page of {size}")
+        default_ms = timed(lambda: default_path(adapter, envelope), repeats)
+        fast_ms = timed(lambda: fast_path(serialize, envelope), repeats)
+        print(f"{size:>9} {default_ms:>8.2f}ms {fast_ms:>8.2f}ms {default_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    main(args.repeats)
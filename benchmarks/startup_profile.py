@@ -0,0 +1,87 @@
+"""
+Cold-start profile of the API: import time per module and time to first request.
+
+First imports `main` in a fresh interpreter with `-X importtime` and lists the
+modules with the largest cumulative import time. Then starts uvicorn on
+`--port` and polls `GET /v1/health/` until it answers 200, reporting the time
+from process start to that first successful request. The second step runs the
+lifespan, so it needs the services in `.env` (Postgres, Redis) to be reachable;
+`--imports-only` skips it.
+
+Usage:
+    python -m benchmarks.startup_profile [--top 25] [--port 8765] [--imports-only]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def import_times() -> list[tuple[int, int, str, bool]]:
+    """(self us, cumulative us, module, top level) for every module imported by `import main`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|", 2)
+        # nested imports are indented under the module that triggered them
+        top_level = not module.removeprefix(" ").startswith(" ")
+        rows.append((int(self_us), int(cumulative_us), module.strip(), top_level))
+    return rows
+
+
+def time_to_first_request(port: int, timeout: float) -> float:
+    url = f"http://127.0.0.1:{port}/v1/health/"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise SystemExit(f"uvicorn exited with code {server.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError, TimeoutError):
+                pass
+            time.sleep(0.05)
+        raise SystemExit(f"no successful response from {url} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(top: int, port: int, timeout: float, imports_only: bool):
+    rows = import_times()
+    total_us = sum(cumulative_us for _, cumulative_us, _, top_level in rows if top_level)
+    print(f"import main: {total_us / 1e6:.2f}s over {len(rows)} modules")
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    for self_us, cumulative_us, module, _ in sorted(rows, key=lambda row: row[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>9.1f}ms {self_us / 1000:>7.1f}ms  {module}")
+
+    if not imports_only:
+        seconds = time_to_first_request(port, timeout)
+        print(f"\nprocess start to first 200 from /v1/health/: {seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--imports-only", action="store_true")
+    args = parser.parse_args()
+    main(args.top, args.port, args.timeout, args.imports_only)
@@ -0,0 +1,96 @@
+"""
+Event-loop lag while 50 uploads with the same filename are spooled at once.
+
+Compares the old `shutil.copyfileobj` into `temp_{filename}` with the
+`utils.spool` layer, both forced to disk and kept in memory. Every upload gets
+distinct bytes, so collisions show up as corrupted spool files.
+
+Usage:
+    python -m benchmarks.upload_spooling [--uploads 50] [--size-mb 8]
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from fastapi import UploadFile
+
+from utils.spool import spool_upload
+
+TICK = 0.005
+
+
+async def measure_lag(stop: asyncio.Event, samples: list[float]):
+    """Record how late a 5ms timer fires; any blocking call shows up as lag."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        samples.append(time.perf_counter() - start - TICK)
+
+
+def make_upload(index: int, size: int) -> tuple[UploadFile, bytes]:
+    body = index.to_bytes(4, "big") * (size // 4)
+    return UploadFile(file=io.BytesIO(body), filename="resume.pdf", size=len(body)), body
+
+
+async def legacy_spool(upload: UploadFile, expected: bytes) -> bool:
+    temp_file_path = f"temp_{upload.filename}"
+    try:
+        with open(temp_file_path, "wb") as buffer:
+            shutil.copyfileobj(upload.file, buffer)
+        await asyncio.sleep(0)  # parsing would happen here
+        with open(temp_file_path, "rb") as f:
+            return f.read() == expected
+    finally:
+        if os.path.exists(temp_file_path):
+            os.remove(temp_file_path)
+
+
+async def new_spool(upload: UploadFile, expected: bytes, spool_dir: str, in_memory_max: int) -> bool:
+    async with spool_upload(upload, spool_dir=spool_dir, in_memory_max_bytes=in_memory_max) as spooled:
+        await asyncio.sleep(0)  # parsing would happen here
+        if spooled.data is not None:
+            return spooled.data == expected
+        with open(spooled.path, "rb") as f:
+            return f.read() == expected
+
+
+async def run(name: str, make_coro, uploads: int, size: int):
+    stop = asyncio.Event()
+    samples: list[float] = []
+    ticker = asyncio.create_task(measure_lag(stop, samples))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(make_coro(*make_upload(i, size)) for i in range(uploads)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    intact = sum(1 for r in results if r is True)
+    lag_ms = sorted(s * 1000 for s in samples) or [0.0]
+    print(
+        f"{name:<20} {elapsed:>7.3f}s  intact {intact:>3}/{uploads}  "
+        f"lag p50 {statistics.median(lag_ms):>7.2f}ms  max {lag_ms[-1]:>8.2f}ms"
+    )
+
+
+async def main(uploads: int, size: int):
+    with tempfile.TemporaryDirectory() as spool_dir:
+        print(f"{uploads} concurrent uploads of resume.pdf, {size / 1024 / 1024:.1f} MB each")
+        await run("legacy copyfileobj", legacy_spool, uploads, size)
+        await run("spool to disk", lambda u, e: new_spool(u, e, spool_dir, 0), uploads, size)
+        await run("spool in memory", lambda u, e: new_spool(u, e, spool_dir, size), uploads, size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--size-mb", type=float, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.uploads, int(args.size_mb * 1024 * 1024)))
@@ -1,4 +1,7 @@
+import os
+import tempfile
 from functools import cached_property
+from typing import Literal
 
 from pydantic import AnyHttpUrl, PostgresDsn, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +33,39 @@ class Settings(BaseSettings):
     EMBEDDING_SCORE_THRESHOLD: float = 0.1
     EMBEDDING_TOPK: int = 3
 
+    # Local caches that should survive restarts
+    CACHE_DIR: str = os.path.join(tempfile.gettempdir(), "cv-parser-cache")
+
+    # Uploads
+    UPLOAD_SPOOL_DIR: str = os.path.join(tempfile.gettempdir(), "cv-parser-uploads")
+    UPLOAD_IN_MEMORY_MAX_BYTES: int = 5 * 1024 * 1024  # smaller uploads are parsed without touching disk
+
+    # Parsing
+    PARSER_POOL_SIZE: int = 2  # worker processes for text extraction, 0 parses in a thread instead
+    PARSER_PAGES_PER_TASK: int = 8  # longer PDFs are split into page ranges parsed in parallel
+
+    # OCR
+    OCR_ENGINE: Literal["unstructured_api", "local"] = "unstructured_api"
+    OCR_MIN_PAGE_CHARS: int = 20  # pages with less text than this go to the next extraction tier
+
+    # Extraction
+    EXTRACTION_MODE: Literal["sectioned", "unified"] = "sectioned"  # one LLM call per section, or one for the whole resume
+    EXTRACTION_MAX_CONCURRENCY: int = 12  # process-wide cap on in-flight LLM extraction calls
+    EXTRACTION_SECTION_TIMEOUT: float = 60.0  # seconds
+    EXTRACTION_CACHE_BACKEND: Literal["redis", "disk", "none"] = "redis"
+    EXTRACTION_CACHE_TTL: int = 60 * 60 * 24 * 30  # seconds since last use
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 10000  # disk backend only, Redis relies on its maxmemory policy
+
+    # Agent
+    AGENT_TOOL_MAX_CONCURRENCY: int = 8  # process-wide cap on tool calls running at once, across sessions
+    AGENT_TOOL_TIMEOUT: float = 30.0  # seconds per tool call before it is reported to the model as failed
+    AGENT_SQL_CACHE_ENABLED: bool = True  # cache the agent's SELECT results in Redis
+    AGENT_SQL_CACHE_TTL: int = 5 * 60  # seconds, results are also invalidated by candidate writes
+    AGENT_ANSWER_CACHE_ENABLED: bool = True  # reuse final answers to similar standalone questions
+    AGENT_ANSWER_CACHE_THRESHOLD: float = 0.95  # cosine similarity of question embeddings needed to reuse an answer
+    AGENT_ANSWER_CACHE_TTL: int = 60 * 60  # seconds, answers are also dropped on candidate writes
+    AGENT_ANSWER_CACHE_MAX_ENTRIES: int = 1000  # per process, the oldest answers are dropped first; 0 disables the cache
+
     # Database
     DATABASE_USER: str
     DATABASE_PASSWORD: str
@@ -37,12 +73,42 @@ class Settings(BaseSettings):
     DATABASE_PORT: int
     DATABASE_NAME: str
     ECHO_SQL: bool = False
+    DB_POOL_SIZE: int = 10  # connections kept open per process
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection before failing
+    DB_POOL_RECYCLE: int = 30 * 60  # seconds before a connection is replaced, -1 to never recycle
+    DB_POOL_PRE_PING: bool = True  # check connections on checkout, survives database restarts
+    DB_STATEMENT_CACHE_SIZE: int = 100  # prepared statements cached per connection, 0 disables
+    DATABASE_REPLICA_HOSTNAME: str | None = None  # read-only endpoints and the agent's SQL go here when set
+    DATABASE_REPLICA_PORT: int | None = None  # defaults to DATABASE_PORT
+    DB_REPLICA_CONNECT_TIMEOUT: float = 5.0  # seconds before an unreachable replica falls back to the primary
+    DB_REPLICA_RETRY_AFTER: int = 30  # seconds reads stay on the primary after the replica failed
+    SKILL_ID_CACHE_SIZE: int = 5000  # skill name -> id entries kept in memory per process
+
+    # Pagination
+    PAGINATION_COUNT_MODE: Literal["exact", "approximate", "cached", "none"] = "exact"  # default total for page/size requests
+    PAGINATION_COUNT_CACHE_TTL: int = 60  # seconds a cached candidates count is reused
+
+    # Candidate read cache
+    CANDIDATE_CACHE_ENABLED: bool = True
+    CANDIDATE_CACHE_TTL: int = 60 * 60  # seconds, entries are also invalidated on update
 
     # Redis
     REDIS_HOST: str
     REDIS_PORT: str
     REDIS_DB: int = 0
 
+    # Ingestion jobs
+    INGESTION_BACKEND: Literal["redis", "memory"] = "redis"  # memory is single-process, for tests
+    INGESTION_WORKERS: int = 2  # background workers per API replica
+    INGESTION_JOB_TTL: int = 60 * 60 * 24  # seconds a finished job stays queryable
+    INGESTION_WORKER_LEASE: int = 30  # seconds after a replica stops heartbeating before its jobs are requeued
+    INGESTION_MAX_ATTEMPTS: int = 3  # runs before a job that keeps taking its worker down is marked failed
+    BULK_UPLOAD_CONCURRENCY: int = 4  # files processed at once per bulk request
+    BULK_UPLOAD_MAX_FILES: int = 1000
+    BULK_UPLOAD_MAX_FILE_BYTES: int = 20 * 1024 * 1024  # largest resume accepted inside a ZIP archive
+    BULK_UPLOAD_MAX_ARCHIVE_BYTES: int = 512 * 1024 * 1024  # uncompressed size of one ZIP archive
+
     # AWS S3
     AWS_S3_BUCKET_NAME:str | None = None
     AWS_S3_ACCESS_KEY_ID:str | None = None
@@ -92,6 +158,25 @@ class Settings(BaseSettings):
             )
         )
 
+    def _replica_uri(self, scheme: str) -> str | None:
+        if not self.DATABASE_REPLICA_HOSTNAME:
+            return None
+        return str(
+            PostgresDsn.build(
+                scheme=scheme,
+                username=self.DATABASE_USER,
+                password=self.DATABASE_PASSWORD,
+                host=self.DATABASE_REPLICA_HOSTNAME,
+                port=self.DATABASE_REPLICA_PORT or self.DATABASE_PORT,
+                path=self.DATABASE_NAME,
+            )
+        )
+
+    @computed_field
+    @cached_property
+    def DATABASE_REPLICA_URI(self) -> str | None:
+        return self._replica_uri("postgresql+asyncpg")
+
     @field_validator("BACKEND_CORS_ORIGINS")
     def assemble_cors_origins(cls, v: str | list[str]) -> list[str] | str:
         if isinstance(v, str) and not v.startswith("["):
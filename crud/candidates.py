@@ -1,46 +1,115 @@
-from typing import List
-from models import Candidate
+from datetime import datetime
+from typing import List, Sequence
+from models import Candidate, Certification, Education, Experience, Project
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import insert, select, text, tuple_
+from core.config import settings
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload, Query
-from schema.candidates import CandidateCreate, CandidateUpdate
+from sqlalchemy.orm import load_only, raiseload, selectinload, undefer, Query
+from crud.sections import add_candidate_skills, resolve_skill_ids, skill_id_cache
+from schema.candidates import CANDIDATE_RELATIONSHIPS, CandidateCreate, CandidateFieldset, CandidateUpdate
+from schema.certificates import CertificationBase
+from schema.education import EducationBase
+from schema.experience import ExperienceBase
+from schema.projects import ProjectBase
+from schema.responses import CountMode
+from schema.skills import SkillCreate
 from sqlalchemy.sql.functions import func
 from sqlalchemy.exc import IntegrityError
+from utils.cache import LRUCache, get_cache_stats
+
+
+def candidate_load_options(fieldset: CandidateFieldset | None = None) -> list:
+    """
+    Loader options for a candidate read. Without a fieldset everything is
+    loaded, including the deferred `content`; with one, only its columns and
+    relationships are, and touching anything else raises instead of lazy
+    loading.
+    """
+    if fieldset is None:
+        return [
+            undefer(Candidate.content),
+            *(selectinload(getattr(Candidate, name)) for name in CANDIDATE_RELATIONSHIPS),
+        ]
+    # created_at backs the pagination cursor
+    columns = fieldset.fields | {"id", "created_at"}
+    return [
+        load_only(*(getattr(Candidate, name) for name in sorted(columns))),
+        *(selectinload(getattr(Candidate, name)) for name in sorted(fieldset.include)),
+        raiseload("*"),
+    ]
+
 
 async def get_candidates_paginated(
     db_session: AsyncSession,
     page: int = 1,
     size: int = 10,
+    fieldset: CandidateFieldset | None = None,
 ) -> List[Candidate]:
-    query = select(Candidate).options(
-        selectinload(Candidate.certifications),
-        selectinload(Candidate.educations),
-        selectinload(Candidate.experiences),
-        selectinload(Candidate.projects),
-        selectinload(Candidate.skills),
-    ) 
-    query = query.limit(size).offset((page - 1) * size)
+    query = select(Candidate).options(*candidate_load_options(fieldset))
+    query = query.order_by(Candidate.created_at, Candidate.id).limit(size).offset((page - 1) * size)
     result = await db_session.execute(query)
     candidates = result.scalars().all() 
     return candidates
 
+async def get_candidates_keyset(
+    db_session: AsyncSession,
+    size: int = 10,
+    after: tuple[datetime, int] | None = None,
+    fieldset: CandidateFieldset | None = None,
+) -> List[Candidate]:
+    """
+    The `size` candidates following the (created_at, id) position `after`.
+
+    Served from ix_candidates_created_at_id, so the cost doesn't grow with
+    how deep the page is, unlike OFFSET.
+    """
+    query = select(Candidate).options(*candidate_load_options(fieldset))
+    if after is not None:
+        query = query.where(tuple_(Candidate.created_at, Candidate.id) > tuple_(*after))
+    query = query.order_by(Candidate.created_at, Candidate.id).limit(size)
+    result = await db_session.execute(query)
+    return result.scalars().all()
+
 async def get_candidates_count(db_session: AsyncSession) -> int:
     result = await db_session.execute(select(func.count()).select_from(Candidate))
     return result.scalar()
 
-async def get_candidate(db_session: AsyncSession, candidate_id: int) -> Candidate:
+async def get_candidates_count_estimate(db_session: AsyncSession) -> int | None:
+    """The planner's row estimate, kept current by autovacuum. None if the table was never analyzed."""
+    result = await db_session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'candidates'::regclass")
+    )
+    estimate = result.scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+candidates_count_cache: LRUCache[str, int] = LRUCache(
+    1, ttl=settings.PAGINATION_COUNT_CACHE_TTL, stats=get_cache_stats("candidates_count")
+)
+
+async def get_candidates_total(db_session: AsyncSession, mode: CountMode) -> int | None:
+    if mode == "none":
+        return None
+    if mode == "approximate":
+        estimate = await get_candidates_count_estimate(db_session)
+        if estimate is not None:
+            return estimate
+    elif mode == "cached":
+        total = candidates_count_cache.get("candidates")
+        if total is None:
+            total = await get_candidates_count(db_session)
+            candidates_count_cache.set("candidates", total)
+        return total
+    return await get_candidates_count(db_session)
+
+async def get_candidate(
+    db_session: AsyncSession, candidate_id: int, fieldset: CandidateFieldset | None = None
+) -> Candidate:
     candidate = (
         await db_session.scalars(
             select(Candidate)
             .where(Candidate.id == candidate_id)
-            .options(
-                selectinload(Candidate.certifications),
-                selectinload(Candidate.educations),
-                selectinload(Candidate.experiences),
-                selectinload(Candidate.projects),
-                selectinload(Candidate.skills),
-            )
+            .options(*candidate_load_options(fieldset))
         )
     ).first()
     if not candidate:
@@ -48,18 +117,14 @@ async def get_candidate(db_session: AsyncSession, candidate_id: int) -> Candidat
     return candidate
 
 
-async def get_candidate_by_email(db_session: AsyncSession, email: str) -> Candidate:
+async def get_candidate_by_email(
+    db_session: AsyncSession, email: str, fieldset: CandidateFieldset | None = None
+) -> Candidate:
     return (
         await db_session.scalars(
             select(Candidate)
             .where(Candidate.email == email)
-            .options(
-                selectinload(Candidate.certifications),
-                selectinload(Candidate.educations),
-                selectinload(Candidate.experiences),
-                selectinload(Candidate.projects),
-                selectinload(Candidate.skills),
-            )
+            .options(*candidate_load_options(fieldset))
         )
     ).first()
 
@@ -71,13 +136,19 @@ async def get_candidate_by_embeddings_namespace(
         await db_session.scalars(
             select(Candidate)
             .where(Candidate.embeddings_namespace == embeddings_namespace)
-            .options(
-                selectinload(Candidate.certifications),
-                selectinload(Candidate.educations),
-                selectinload(Candidate.experiences),
-                selectinload(Candidate.projects),
-                selectinload(Candidate.skills),
-            )
+            .options(*candidate_load_options())
+        )
+    ).first()
+
+
+async def get_candidate_by_content_hash(
+    db_session: AsyncSession, content_hash: str
+) -> Candidate:
+    return (
+        await db_session.scalars(
+            select(Candidate)
+            .where(Candidate.content_hash == content_hash)
+            .options(*candidate_load_options())
         )
     ).first()
 
@@ -98,13 +169,7 @@ async def create_candidate(
     # Reload the candidate with all necessary relationships
     query = (
         select(Candidate)
-        .options(
-            selectinload(Candidate.educations),
-            selectinload(Candidate.experiences),
-            selectinload(Candidate.projects),
-            selectinload(Candidate.certifications),
-            selectinload(Candidate.skills),
-        )
+        .options(*candidate_load_options())
         .where(Candidate.id == candidate.id)
     )
     result = await db_session.execute(query)
@@ -112,6 +177,57 @@ async def create_candidate(
     return candidate
 
 
+async def create_candidate_with_sections(
+    db_session: AsyncSession,
+    candidate_in: CandidateCreate,
+    certifications: Sequence[CertificationBase] = (),
+    educations: Sequence[EducationBase] = (),
+    experiences: Sequence[ExperienceBase] = (),
+    projects: Sequence[ProjectBase] = (),
+    skills: Sequence[SkillCreate] = (),
+) -> Candidate:
+    """
+    Insert a candidate and all of its sections in one transaction.
+
+    Each section table gets a single multi-row INSERT, skills are upserted as
+    a set (see `resolve_skill_ids`), and the whole write is committed once, so
+    it either lands completely or not at all.
+    """
+    try:
+        candidate = Candidate(**candidate_in.model_dump())
+        db_session.add(candidate)
+        await db_session.flush()
+
+        for model, rows in (
+            (Certification, certifications),
+            (Education, educations),
+            (Experience, experiences),
+            (Project, projects),
+        ):
+            if rows:
+                await db_session.execute(
+                    insert(model), [{**row.model_dump(), "candidate_id": candidate.id} for row in rows]
+                )
+
+        skill_ids = await resolve_skill_ids(db_session, skills)
+        await add_candidate_skills(db_session, candidate.id, skill_ids.values())
+
+        await db_session.commit()
+    except Exception:
+        await db_session.rollback()
+        raise
+    skill_id_cache.update(skill_ids.items())
+
+    query = (
+        select(Candidate)
+        .options(*candidate_load_options())
+        .where(Candidate.id == candidate.id)
+        .execution_options(populate_existing=True)
+    )
+    result = await db_session.execute(query)
+    return result.scalars().first()
+
+
 async def update_candidate(
     db_session: AsyncSession, candidate_id: int, candidate_in: CandidateUpdate
 ) -> Candidate:
@@ -127,5 +243,11 @@ async def update_candidate(
 
     db_session.add(candidate)
     await db_session.commit()
-    await db_session.refresh(candidate)
-    return candidate
+    # reload rather than refresh(), which would leave the deferred content unloaded
+    result = await db_session.execute(
+        select(Candidate)
+        .where(Candidate.id == candidate_id)
+        .options(*candidate_load_options())
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().one()
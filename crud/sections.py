@@ -1,11 +1,16 @@
+from typing import Iterable, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from models import Project, Education, Experience, Skill, Certification, Candidate
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from core.config import settings
+from models import Project, Education, Experience, Skill, Certification, candidate_skills
 from sqlalchemy import select
 from schema.projects import ProjectCreate
 from schema.education import EducationCreate
 from schema.experience import ExperienceCreate
 from schema.skills import SkillCreate
 from schema.certificates import CertificationCreate
+from services.skills import skill_canonicalizer
+from utils.cache import LRUCache, get_cache_stats
 
 async def create_project(db_session: AsyncSession, project_data: ProjectCreate) -> Project:
     new_project = Project(**project_data.model_dump())
@@ -29,32 +34,59 @@ async def create_experience(db_session: AsyncSession, experience_data: Experienc
     return new_experience
 
 
-async def create_skill(db_session: AsyncSession, skill_data:SkillCreate, candidate_id: int):
-    # Check if the skill already exists
-    result = await db_session.execute(select(Skill).where(Skill.name == skill_data.name))
-    existing_skill = result.scalars().first()
-
-    if existing_skill:
-        # If the skill exists, associate it with the candidate
-        candidate = await db_session.get(Candidate, candidate_id)
-        if candidate and existing_skill not in candidate.skills:
-            candidate.skills.append(existing_skill)
-            await db_session.commit()
-        return existing_skill
-    else:
-        # If the skill does not exist, create it and associate it with the candidate
-        new_skill = Skill(**skill_data.model_dump())
-        db_session.add(new_skill)
-        await db_session.commit()
-        await db_session.refresh(new_skill)
-
-        # Associate the new skill with the candidate
-        candidate = await db_session.get(Candidate, candidate_id)
-        if candidate:
-            candidate.skills.append(new_skill)
-            await db_session.commit()
-
-        return new_skill
+skill_id_cache: LRUCache[str, int] = LRUCache(settings.SKILL_ID_CACHE_SIZE, stats=get_cache_stats("skill_ids"))
+
+
+async def resolve_skill_ids(db_session: AsyncSession, skills: Sequence[SkillCreate]) -> dict[str, int]:
+    """
+    Map canonical skill names to ids, inserting the skills that don't exist yet.
+
+    Names missing from `skill_id_cache` cost one INSERT ... ON CONFLICT DO
+    NOTHING RETURNING and, for names that already existed, one SELECT. The
+    caller must add the result to `skill_id_cache` once its transaction has
+    committed.
+    """
+    unique_skills = {skill_canonicalizer.canonicalize(skill.name): skill for skill in skills}
+    skill_ids = {}
+    for canonical_name in unique_skills:
+        skill_id = skill_id_cache.get(canonical_name)
+        if skill_id is not None:
+            skill_ids[canonical_name] = skill_id
+    # sorted so concurrent uploads take the unique index locks in the same order
+    missing = sorted(name for name in unique_skills if name not in skill_ids)
+    if not missing:
+        return skill_ids
+
+    inserted = await db_session.execute(
+        pg_insert(Skill)
+        .values([{**unique_skills[name].model_dump(), "canonical_name": name} for name in missing])
+        .on_conflict_do_nothing(index_elements=[Skill.canonical_name])
+        .returning(Skill.canonical_name, Skill.id)
+    )
+    skill_ids.update(inserted.all())
+    existing = [name for name in missing if name not in skill_ids]
+    if existing:
+        result = await db_session.execute(
+            select(Skill.canonical_name, Skill.id).where(Skill.canonical_name.in_(existing))
+        )
+        skill_ids.update(result.all())
+    return skill_ids
+
+
+async def add_candidate_skills(db_session: AsyncSession, candidate_id: int, skill_ids: Iterable[int]):
+    rows = [{"candidate_id": candidate_id, "skill_id": skill_id} for skill_id in set(skill_ids)]
+    if rows:
+        await db_session.execute(pg_insert(candidate_skills).values(rows).on_conflict_do_nothing())
+
+
+async def create_skill(db_session: AsyncSession, skill_data: SkillCreate, candidate_id: int) -> Skill:
+    skill_ids = await resolve_skill_ids(db_session, [skill_data])
+    await add_candidate_skills(db_session, candidate_id, skill_ids.values())
+    await db_session.commit()
+    skill_id_cache.update(skill_ids.items())
+    return await db_session.get(Skill, skill_ids[skill_canonicalizer.canonicalize(skill_data.name)])
+
+
 async def create_certification(db_session: AsyncSession, certification_data: CertificationCreate) -> Certification:
     new_certification = Certification(**certification_data.model_dump())
     db_session.add(new_certification)
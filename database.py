@@ -1,7 +1,13 @@
+import asyncio
 import contextlib
+import threading
+import time
 from typing import Any, AsyncIterator
 
+import structlog
 from core.config import settings
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
     AsyncSession,
@@ -9,24 +15,133 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from utils.cache import get_cache_stats
+from utils.metrics import Histogram
+
+logger = structlog.stdlib.get_logger()
 
 class Base(DeclarativeBase):
     # https://docs.sqlalchemy.org/en/14/orm/extensions/asyncio.html#preventing-implicit-io-when-using-asyncsession
     __mapper_args__ = {"eager_defaults": True}
 
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait and how many are waiting."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = Histogram()
+        self.waiters = 0
+        self._waiters_lock = threading.Lock()
+
+    def _do_get(self):
+        with self._waiters_lock:
+            self.waiters += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.wait_histogram.observe(time.perf_counter() - start)
+            with self._waiters_lock:
+                self.waiters -= 1
+
+
+def engine_kwargs_from_settings() -> dict[str, Any]:
+    return {
+        "echo": settings.ECHO_SQL,
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    }
+
+
+def replica_engine_kwargs_from_settings() -> dict[str, Any]:
+    kwargs = engine_kwargs_from_settings()
+    kwargs["connect_args"] = {**kwargs["connect_args"], "timeout": settings.DB_REPLICA_CONNECT_TIMEOUT}
+    return kwargs
+
+
 # Heavily inspired by https://praciano.com.br/fastapi-and-async-sqlalchemy-20-with-pytest-done-right.html
 class DatabaseSessionManager:
-    def __init__(self, host: str, engine_kwargs: dict[str, Any] = {}):
+    def __init__(
+        self,
+        host: str,
+        engine_kwargs: dict[str, Any] = {},
+        read_host: str | None = None,
+        read_engine_kwargs: dict[str, Any] | None = None,
+    ):
         self._engine = create_async_engine(host, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(autocommit=False, bind=self._engine, expire_on_commit=False)
+        self.statement_cache_stats = get_cache_stats("db_statements")
+        event.listen(self._engine.sync_engine, "before_cursor_execute", self._count_statement_cache)
+
+        self._read_engine = None
+        self._read_sessionmaker = None
+        self._replica_retry_at = 0.0
+        if read_host:
+            self._read_engine = create_async_engine(read_host, **(read_engine_kwargs or engine_kwargs))
+            self._read_sessionmaker = async_sessionmaker(autocommit=False, expire_on_commit=False)
+            event.listen(self._read_engine.sync_engine, "before_cursor_execute", self._count_statement_cache)
+
+    def _count_statement_cache(self, conn, cursor, statement, parameters, context, executemany):
+        # the asyncpg adapter keeps prepared statements in an LRU keyed by the SQL text
+        cache = getattr(conn.connection.dbapi_connection, "_prepared_statement_cache", None)
+        if cache is None:
+            return
+        if statement in cache:
+            self.statement_cache_stats.hit()
+        else:
+            self.statement_cache_stats.miss()
+
+    def replica_available(self) -> bool:
+        """A replica is configured and hasn't failed within the last DB_REPLICA_RETRY_AFTER seconds."""
+        return self._read_engine is not None and time.monotonic() >= self._replica_retry_at
+
+    def mark_replica_down(self):
+        self._replica_retry_at = time.monotonic() + settings.DB_REPLICA_RETRY_AFTER
+
+    def pool_status(self) -> dict[str, Any]:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        return self._pool_status(self._engine)
+
+    def replica_status(self) -> dict[str, Any] | None:
+        if self._read_engine is None:
+            return None
+        return {"available": self.replica_available(), **self._pool_status(self._read_engine)}
+
+    @staticmethod
+    def _pool_status(engine) -> dict[str, Any]:
+        pool = engine.pool
+        status = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # QueuePool counts overflow from -pool_size until the pool is full
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+        }
+        if isinstance(pool, InstrumentedAsyncPool):
+            status["waiters"] = pool.waiters
+            status["checkout_wait"] = pool.wait_histogram.snapshot()
+        return status
 
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        if self._read_engine is not None:
+            await self._read_engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._read_engine = None
+        self._read_sessionmaker = None
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -54,8 +169,46 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_session(self, primary: bool = False) -> AsyncIterator[AsyncSession]:
+        """
+        A session for reads, on the replica when one is configured and reachable
+        and on the primary otherwise, or when `primary` asks for read-after-write.
 
-sessionmanager = DatabaseSessionManager(settings.DATABASE_URI, {"echo": settings.ECHO_SQL})
+        The replica connection is checked out up front so an unreachable replica
+        falls back here instead of failing the first query; after a failure reads
+        stay on the primary for DB_REPLICA_RETRY_AFTER seconds.
+        """
+        connection = None
+        if not primary and self.replica_available():
+            try:
+                connection = await self._read_engine.connect()
+            except (OSError, asyncio.TimeoutError, DBAPIError) as e:
+                self.mark_replica_down()
+                await logger.warning("Read replica unavailable, reading from the primary", error=str(e))
+
+        if connection is None:
+            async with self.session() as session:
+                yield session
+            return
+
+        session = self._read_sessionmaker(bind=connection)
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+            await connection.close()
+
+
+sessionmanager = DatabaseSessionManager(
+    settings.DATABASE_URI,
+    engine_kwargs_from_settings(),
+    read_host=settings.DATABASE_REPLICA_URI,
+    read_engine_kwargs=replica_engine_kwargs_from_settings(),
+)
 
 
 async def get_db_session():
@@ -16,6 +16,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi_limiter import FastAPILimiter
 from sqlalchemy.exc import IntegrityError
+from agent.schema_digest import load_schema_digest
 from agent.workflow import CandidatesAgent 
 from api.router import router as api_router
 from core.config import settings
@@ -30,9 +31,23 @@ from utils.exceptions.global_exceptions import (
 from utils.limiter import user_id_identifier
 from utils.logger import configure_logger
 from utils.middlewares.server_error import ServerErrorMiddleware
-from utils.redis import get_redis_client
+from utils.redis import close_shared_redis_client, get_redis_client, get_shared_redis_client
+from database import sessionmanager
+from services.documents import get_document_processor, parser_pool
+from services.skills import skill_canonicalizer
+from services.jobs import IngestionJobQueue, create_job_backend
 
 configure_logger(settings.LOG_LEVEL, settings.LOG_JSON_ENABLED)
+logger = structlog.stdlib.get_logger()
+
+
+async def load_skill_aliases():
+    try:
+        async with sessionmanager.session() as db_session:
+            await skill_canonicalizer.load(db_session)
+    except Exception as e:
+        # the seed aliases still apply; the table is picked up on the next start
+        await logger.warning("Could not load skill aliases", error=str(e))
 
 
 @asynccontextmanager
@@ -40,12 +55,26 @@ async def lifespan(app: FastAPI):
     try:
         redis_client = await get_redis_client()
         await FastAPILimiter.init(redis_client, identifier=user_id_identifier)
-        app.state.graph = CandidatesAgent()
+        await parser_pool.start()
+        await load_skill_aliases()
+        # built here rather than at import; Pinecone is only contacted on first use
+        get_document_processor()
+        app.state.graph = CandidatesAgent(schema_digest=await load_schema_digest())
+        ingestion_queue = IngestionJobQueue(
+            create_job_backend(await get_shared_redis_client()),
+            workers=settings.INGESTION_WORKERS,
+            lease=settings.INGESTION_WORKER_LEASE,
+            max_attempts=settings.INGESTION_MAX_ATTEMPTS,
+        )
+        await ingestion_queue.start()
+        app.state.ingestion_queue = ingestion_queue
         yield
 
+        await ingestion_queue.stop()
         await FastAPILimiter.close()
     finally:
-        pass
+        parser_pool.shutdown()
+        await close_shared_redis_client()
 
 
 app = FastAPI(
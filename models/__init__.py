@@ -7,4 +7,5 @@ from .education import Education
 from .experience import Experience
 from .projects import Project
 from .skills import Skill
+from .skill_aliases import SkillAlias
 from .candidate_skills import candidate_skills
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import List, Optional
 from sqlalchemy import (
     Boolean,
     DateTime,
+    Index,
     Integer,
     String,
     func,
@@ -16,6 +17,10 @@ from . import Base
 
 class Candidate(Base):
     __tablename__ = "candidates"
+    __table_args__ = (
+        # keyset pagination order, see crud.candidates.get_candidates_keyset
+        Index("ix_candidates_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, nullable=False, primary_key=True, autoincrement=True, index=True)
     email: Mapped[str] = mapped_column(String(30), index=True, unique=True)
@@ -26,8 +31,9 @@ class Candidate(Base):
     hired: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     status: Mapped[str] = mapped_column(String(30), nullable=True)
     resume_url: Mapped[str] = mapped_column(String(100), nullable=True)
-    content: Mapped[TEXT] = mapped_column(TEXT, nullable=True)
+    content: Mapped[TEXT] = mapped_column(TEXT, nullable=True, deferred=True)  # the whole resume, loaded only on request
     embeddings_namespace: Mapped[str] = mapped_column(String(100), nullable=True, unique=True, index=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=True, unique=True, index=True)  # sha256 of the uploaded file
     updated_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=func.current_timestamp(), onupdate=func.current_timestamp()
     )
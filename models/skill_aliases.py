@@ -0,0 +1,20 @@
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class SkillAlias(Base):
+    """Maps a normalized spelling of a skill (e.g. "py") to its canonical name ("python")."""
+
+    __tablename__ = "skill_aliases"
+
+    alias: Mapped[str] = mapped_column(String(100), primary_key=True)
+    canonical_name: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=func.current_timestamp(),
+        server_default=func.now(),
+    )
@@ -16,7 +16,8 @@ class Skill(Base):
     __tablename__ = "skills"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(50), nullable=False)  # as first extracted, for display
+    canonical_name: Mapped[str] = mapped_column(String(50), nullable=False, unique=True, index=True)  # see services/skills.py
     category: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     updated_at: Mapped[DateTime] = mapped_column(
@@ -1,7 +1,9 @@
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List
 
-from pydantic import Field, BaseModel, EmailStr 
+from pydantic import ConfigDict, Field, BaseModel, EmailStr, create_model
 from .certificates import CertificationBase
 from .education import EducationBase
 from .experience import ExperienceBase
@@ -46,7 +48,7 @@ class CandidateBase(BaseModel):
     content: Optional[str] = None
 
 class CandidateCreate(CandidateBase):
-    pass
+    content_hash: Optional[str] = None
 
 class CandidateUpdate(BaseModel):
     email: Optional[EmailStr | str] = None # str added to make it easier on the OCR
@@ -72,4 +74,65 @@ class CandidateResponse(CandidateBase):
     updated_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+CANDIDATE_RELATIONSHIPS = ("educations", "experiences", "projects", "certifications", "skills")
+CANDIDATE_FIELDS = tuple(name for name in CandidateResponse.model_fields if name not in CANDIDATE_RELATIONSHIPS)
+# The resume text is large and rarely needed, so it is only returned when asked for
+SUMMARY_FIELDS = tuple(name for name in CANDIDATE_FIELDS if name != "content")
+
+
+@dataclass(frozen=True)
+class CandidateFieldset:
+    """
+    The columns (`?fields=`) and relationships (`?include=`) of a candidate a
+    request asked for. `id` is always part of it.
+    """
+
+    fields: frozenset[str]
+    include: frozenset[str]
+
+    @classmethod
+    def parse(cls, fields: str | None, include: str | None) -> "CandidateFieldset | None":
+        """
+        None (the full candidate) when neither parameter is given. Otherwise a
+        missing `fields` means every column except `content`, and a missing
+        `include` means no relationships.
+        """
+        if fields is None and include is None:
+            return None
+        selected = {f.strip() for f in fields.split(",") if f.strip()} if fields is not None else (
+            set(SUMMARY_FIELDS)
+        )
+        included = {r.strip() for r in include.split(",") if r.strip()} if include is not None else set()
+        if unknown := selected - set(CANDIDATE_FIELDS):
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(CANDIDATE_FIELDS)}")
+        if unknown := included - set(CANDIDATE_RELATIONSHIPS):
+            raise ValueError(
+                f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(CANDIDATE_RELATIONSHIPS)}"
+            )
+        return cls(frozenset(selected | {"id"}), frozenset(included))
+
+    @classmethod
+    def summary(cls) -> "CandidateFieldset":
+        """Every column except `content`, no relationships: the default of the list endpoint."""
+        return cls(frozenset(SUMMARY_FIELDS) | {"id"}, frozenset())
+
+    @property
+    def response_model(self) -> type[BaseModel]:
+        return _partial_candidate_response(self.fields | self.include)
+
+
+@lru_cache(maxsize=256)
+def _partial_candidate_response(names: frozenset[str]) -> type[BaseModel]:
+    """CandidateResponse restricted to `names`, keeping its field order, types and defaults."""
+    return create_model(
+        "PartialCandidateResponse",
+        __config__=ConfigDict(from_attributes=True),
+        **{
+            name: (field.annotation, field)
+            for name, field in CandidateResponse.model_fields.items()
+            if name in names
+        },
+    )
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+
+from .candidates import CandidateExtraction
+from .certificates import CertificationList
+from .education import EducationList
+from .experience import ExperienceList
+from .projects import ProjectList
+from .skills import SkillList
+
+
+class ResumeExtraction(BaseModel):
+    """Extracted data about every section of a resume in a single pass."""
+
+    candidate: CandidateExtraction = Field(
+        description="The basic personal information of the candidate."
+    )
+    certifications: CertificationList = Field(
+        description="The certifications obtained by the candidate."
+    )
+    education: EducationList = Field(
+        description="The educational background of the candidate."
+    )
+    experience: ExperienceList = Field(
+        description="The professional experience of the candidate."
+    )
+    skills: SkillList = Field(
+        description="The skills possessed by the candidate."
+    )
+    projects: ProjectList = Field(
+        description="The projects completed by the candidate."
+    )
@@ -2,3 +2,19 @@ from pydantic import BaseModel
 
 class HealthCheck(BaseModel):
     message: str
+
+
+class CacheHealth(BaseModel):
+    caches: dict[str, dict]
+
+
+class DatabaseHealth(BaseModel):
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    waiters: int = 0
+    checkout_wait: dict = {}
+    statement_cache: dict
+    replica: dict | None = None  # the read replica's pool and whether reads currently go to it
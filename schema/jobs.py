@@ -0,0 +1,44 @@
+from datetime import datetime
+from typing import Any, Literal, Optional
+
+from fastapi import status
+from pydantic import BaseModel, Field
+
+
+class IngestionJob(BaseModel):
+    id: str
+    status: Literal["queued", "running", "succeeded", "failed"] = "queued"
+    stage: Optional[str] = Field(
+        default=None,
+        description="The pipeline stage the job is in (parsing, indexing, extracting, persisting).",
+    )
+    filename: Optional[str] = None
+    content_hash: Optional[str] = None
+    candidate_id: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = Field(
+        default=0,
+        description="How many times a worker has picked the job up, counting runs lost to a crashed worker.",
+    )
+    timings: dict[str, float] = Field(
+        default={},
+        description="Seconds spent in each completed stage.",
+    )
+    created_at: datetime
+    updated_at: datetime
+
+
+def ndjson_response_example() -> dict[int, Any]:
+    return {
+        status.HTTP_200_OK: {
+            "description": "Newline delimited JSON, one line per file as it finishes, then a summary",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"type": "file", "index": 1, "filename": "b.pdf", "status": "created", "candidate_id": 42, "error": null}\n'
+                    '{"type": "file", "index": 0, "filename": "a.docx", "status": "failed", "candidate_id": null, "error": "Empty document: a.docx"}\n'
+                    '{"type": "summary", "total": 2, "created": 1, "duplicate": 0, "failed": 1, "skipped": 0}\n',
+                    "schema": {"type": "string"},
+                }
+            },
+        }
+    }
@@ -1,10 +1,15 @@
 from math import ceil
 from collections.abc import Sequence
-from typing import  Generic, TypeVar, Optional
+from typing import  Generic, Literal, TypeVar, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 
 T = TypeVar("T")
+
+# How the total of a paginated response is computed: exact count(*), the
+# planner's estimate, a count cached for a few seconds, or not at all
+CountMode = Literal["exact", "approximate", "cached", "none"]
+
 class ResponseBase(BaseModel, Generic[T]):
     message: Optional[str] = None
     meta: Optional[dict] = None
@@ -20,6 +25,7 @@ class ResponseBasePaginated(BaseModel, Generic[T]):
     size: int | None = None
     total: int | None = None
     pages: int | None = None
+    next_cursor: str | None = None
     status: str = "success"
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
 
@@ -40,18 +46,20 @@ def create_response(
     
 def create_paginated_response(
     data: Sequence[T],
-    page: int,
+    page: int | None,
     size: int,
-    total: int,
+    total: int | None,
     meta: Optional[dict] = {},
     status: str = "success",
+    next_cursor: str | None = None,
 ) -> ResponseBasePaginated[T]:
     return ResponseBasePaginated(
         data=data,
         page=page,
         size=size,
         total=total,
-        pages=ceil(total / size),
+        pages=ceil(total / size) if total is not None else None,
+        next_cursor=next_cursor,
         meta=meta,
         status=status
 )
\ No newline at end of file
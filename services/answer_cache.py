@@ -0,0 +1,117 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import structlog
+from langchain_core.embeddings import Embeddings
+
+from services.query_cache import get_data_version
+from utils.cache import get_cache_stats
+
+logger = structlog.stdlib.get_logger()
+
+
+@dataclass(frozen=True)
+class CachedAnswer:
+    question: str  # the earlier question the answer was given to
+    answer: str
+    similarity: float
+
+
+@dataclass(frozen=True)
+class AnswerLookup:
+    """The outcome of a lookup, kept so a fresh answer can be stored without embedding the question again."""
+
+    hit: CachedAnswer | None
+    vector: np.ndarray | None
+    version: int | None  # data version at lookup time, None when it couldn't be read
+
+
+class SemanticAnswerCache:
+    """
+    Final agent answers keyed by the embedding of the question, per process.
+
+    A lookup embeds the question and takes the most similar stored question
+    (cosine similarity over unit vectors); its answer is reused when the
+    similarity reaches `threshold`. Entries expire after `ttl` seconds, the
+    oldest are dropped past `max_entries` (nothing is kept when it is 0), and
+    all of them are dropped when the data version (bumped by candidate writes)
+    moves. When the version can't be read the cache is bypassed.
+    """
+
+    def __init__(self, embeddings: Embeddings, threshold: float, ttl: int, max_entries: int):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = get_cache_stats("agent_answers")
+        self._vectors: np.ndarray | None = None  # one unit vector per row
+        self._entries: list[tuple[float, str, str]] = []  # (stored at, question, answer), row-aligned
+        self._version: int | None = None
+
+    def clear(self):
+        self._vectors = None
+        self._entries = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop_expired(self):
+        cutoff = time.monotonic() - self.ttl
+        # entries are appended in order, so the expired ones are a prefix
+        expired = next(
+            (i for i, (stored_at, _, _) in enumerate(self._entries) if stored_at > cutoff), len(self._entries)
+        )
+        if expired:
+            self._entries = self._entries[expired:]
+            self._vectors = self._vectors[expired:] if self._entries else None
+
+    async def _embed(self, question: str) -> np.ndarray | None:
+        try:
+            vector = np.asarray(await self.embeddings.aembed_query(question.strip()), dtype=np.float32)
+        except Exception as e:
+            await logger.warning("Answer cache embedding failed", error=str(e))
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    async def lookup(self, question: str) -> AnswerLookup:
+        start = time.perf_counter()
+        version = await get_data_version()
+        if version is None:
+            return AnswerLookup(None, None, None)
+        if version != self._version:
+            self.clear()
+            self._version = version
+
+        vector = await self._embed(question)
+        if vector is None:
+            return AnswerLookup(None, None, None)
+        self._drop_expired()
+        hit = None
+        if self._vectors is not None:
+            similarities = self._vectors @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                _, cached_question, answer = self._entries[best]
+                hit = CachedAnswer(cached_question, answer, round(float(similarities[best]), 4))
+
+        if hit:
+            self.stats.hit()
+        else:
+            self.stats.miss()
+        self.stats.observe("hit" if hit else "miss", time.perf_counter() - start)
+        return AnswerLookup(hit, vector, version)
+
+    def store(self, lookup: AnswerLookup, question: str, answer: str):
+        """Keep an answer computed after `lookup` missed; dropped if candidate data changed meanwhile."""
+        if lookup.vector is None or lookup.version != self._version or self.max_entries <= 0:
+            return
+        self._drop_expired()
+        if len(self._entries) >= self.max_entries:
+            overflow = len(self._entries) - self.max_entries + 1
+            self._entries = self._entries[overflow:]
+            self._vectors = self._vectors[overflow:]
+        self._entries.append((time.monotonic(), question, answer))
+        row = lookup.vector[np.newaxis, :]
+        self._vectors = row if self._vectors is None or not len(self._vectors) else np.vstack([self._vectors, row])
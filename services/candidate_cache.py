@@ -0,0 +1,126 @@
+import hashlib
+import json
+from dataclasses import dataclass
+
+import structlog
+from redis.exceptions import WatchError
+
+from core.config import settings
+from models import Candidate
+from schema.candidates import CandidateResponse
+from utils.cache import get_cache_stats
+from utils.redis import get_shared_redis_client
+from utils.serialization import dumps, serializer_for
+
+logger = structlog.stdlib.get_logger()
+
+
+@dataclass(frozen=True)
+class CachedCandidate:
+    data: str  # CandidateResponse JSON
+    etag: str
+
+    @classmethod
+    def from_data(cls, data: str) -> "CachedCandidate":
+        # the representation itself is the version: any change to the candidate
+        # or its sections changes the tag, even ones that don't bump updated_at
+        return cls(data, f'"{hashlib.sha256(data.encode("utf-8")).hexdigest()[:32]}"')
+
+    def matches(self, if_none_match: str | None) -> bool:
+        if not if_none_match:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+
+class CandidateCache:
+    """
+    Read-through cache of serialized full candidates in Redis.
+
+    Entries live under `candidate:id:{id}`; `candidate:email:{email}` only
+    points at the id, and an email lookup checks the entry's email, so a
+    changed email can't serve another profile. Redis errors count as misses.
+
+    Every invalidation bumps a generation counter. A miss returns the
+    generation it saw, and `set` only stores the loaded candidate if no
+    invalidation happened since, so a row loaded before an update can't be
+    cached after the update's invalidation.
+    """
+
+    generation_key = "candidate:generation"
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.stats = get_cache_stats("candidates")
+
+    async def get_by_id(self, candidate_id: int) -> tuple[CachedCandidate | None, str | None]:
+        """The cached candidate, or None and the generation to fill the cache under."""
+        try:
+            redis = await get_shared_redis_client()
+            generation, data = await redis.mget(self.generation_key, f"candidate:id:{candidate_id}")
+        except Exception as e:
+            await logger.warning("Candidate cache read failed", candidate_id=candidate_id, error=str(e))
+            self.stats.miss("id")
+            return None, None
+        if data is None:
+            self.stats.miss("id")
+            return None, generation or "0"
+        self.stats.hit("id")
+        return CachedCandidate.from_data(data), None
+
+    async def get_by_email(self, email: str) -> tuple[CachedCandidate | None, str | None]:
+        """The cached candidate, or None and the generation to fill the cache under."""
+        try:
+            redis = await get_shared_redis_client()
+            generation, candidate_id = await redis.mget(self.generation_key, f"candidate:email:{email}")
+            data = await redis.get(f"candidate:id:{candidate_id}") if candidate_id else None
+        except Exception as e:
+            await logger.warning("Candidate cache read failed", email=email, error=str(e))
+            self.stats.miss("email")
+            return None, None
+        if data is None or json.loads(data).get("email") != email:
+            self.stats.miss("email")
+            return None, generation or "0"
+        self.stats.hit("email")
+        return CachedCandidate.from_data(data), None
+
+    async def set(self, candidate: Candidate, generation: str | None) -> CachedCandidate:
+        """
+        Serialize a fully loaded candidate and return it; it is only stored when
+        the cache generation is still the one the miss saw.
+        """
+        cached = CachedCandidate.from_data(dumps(serializer_for(CandidateResponse)(candidate)).decode("utf-8"))
+        if generation is None:
+            return cached
+        try:
+            redis = await get_shared_redis_client()
+            async with redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(self.generation_key)
+                if (await pipe.get(self.generation_key) or "0") != generation:
+                    return cached
+                pipe.multi()
+                pipe.set(f"candidate:id:{candidate.id}", cached.data, ex=self.ttl)
+                pipe.set(f"candidate:email:{candidate.email}", candidate.id, ex=self.ttl)
+                await pipe.execute()
+        except WatchError:
+            # invalidated while this fill was being written
+            pass
+        except Exception as e:
+            await logger.warning("Candidate cache write failed", candidate_id=candidate.id, error=str(e))
+        return cached
+
+    async def invalidate(self, candidate_id: int, *emails: str):
+        try:
+            redis = await get_shared_redis_client()
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.incr(self.generation_key)
+                pipe.delete(
+                    f"candidate:id:{candidate_id}", *(f"candidate:email:{email}" for email in emails if email)
+                )
+                await pipe.execute()
+        except Exception as e:
+            # the entry still expires after the TTL
+            await logger.warning("Candidate cache invalidation failed", candidate_id=candidate_id, error=str(e))
+
+
+candidate_cache = CandidateCache(settings.CANDIDATE_CACHE_TTL) if settings.CANDIDATE_CACHE_ENABLED else None
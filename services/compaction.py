@@ -0,0 +1,84 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List
+
+import tiktoken
+
+# Lines this close to the top or bottom of a page are header/footer candidates
+EDGE_LINES = 3
+# A candidate line repeated on at least this share of the pages is dropped
+REPEATED_LINE_SHARE = 0.5
+
+
+def _collapse(line: str) -> str:
+    return re.sub(r"\s+", " ", line).strip()
+
+
+_PAGE_NUMBER = re.compile(r"^(page )?\d+( ?(of|/) ?\d+)?$", re.I)
+
+
+def _edge_key(line: str) -> str:
+    # "Page 2 of 3" and "Page 3 of 3" are the same footer; any other line
+    # must match exactly, so "2018 – 2020" and "2019 – 2021" stay apart
+    return "page #" if _PAGE_NUMBER.match(line) else line
+
+
+def _edge_indexes(lines: List[str]) -> set[int]:
+    count = len(lines)
+    return set(range(min(EDGE_LINES, count))) | set(range(max(count - EDGE_LINES, 0), count))
+
+
+def compact_pages(pages: List[str]) -> str:
+    """
+    Resume text as the LLM should see it: pages joined without loader metadata,
+    whitespace collapsed, blank lines dropped, and header/footer lines that
+    repeat across pages kept only where they first appear.
+    """
+    page_lines = [[line for line in map(_collapse, page.splitlines()) if line] for page in pages]
+
+    repeated: set[str] = set()
+    if len(page_lines) > 1:
+        seen = Counter()
+        for lines in page_lines:
+            seen.update({_edge_key(lines[i]) for i in _edge_indexes(lines)})
+        threshold = max(2, math.ceil(len(page_lines) * REPEATED_LINE_SHARE))
+        repeated = {key for key, count in seen.items() if count >= threshold}
+
+    compacted = []
+    kept_once: set[str] = set()
+    for lines in page_lines:
+        edges = _edge_indexes(lines)
+        kept = []
+        for i, line in enumerate(lines):
+            key = _edge_key(line)
+            if i in edges and key in repeated:
+                # a header repeated on every page is often the name and contact line
+                if key in kept_once:
+                    continue
+                kept_once.add(key)
+            kept.append(line)
+        if kept:
+            compacted.append("\n".join(kept))
+    return "\n\n".join(compacted)
+
+
+@lru_cache
+def _encoding(model: str):
+    """The model's tokenizer, or None when its BPE file can't be downloaded."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        # roughly four characters per token for English text
+        return math.ceil(len(text) / 4)
+    return len(encoding.encode(text))
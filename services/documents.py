@@ -1,10 +1,10 @@
+import asyncio
 import os
-import shutil
-from typing import List
+from functools import cached_property
+from typing import Awaitable, Callable, List, Optional
 
 import structlog
 from fastapi import HTTPException, UploadFile
-from langchain_community.document_loaders import Docx2txtLoader, PyPDFLoader
 from langchain_core.documents import Document
 from langchain_core.prompts import (
     ChatPromptTemplate,
@@ -14,18 +14,36 @@ from langchain_core.prompts import (
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_unstructured import UnstructuredLoader
+from pinecone import Index, Pinecone
 
 from core.config import settings
 from schema.candidates import CandidateExtraction
 from schema.certificates import CertificationList
 from schema.education import EducationList
 from schema.experience import ExperienceList
+from schema.extraction import ResumeExtraction
 from schema.projects import ProjectList
 from schema.skills import SkillList
+from services.compaction import compact_pages, count_tokens
+from services.extraction_cache import create_extraction_cache
+from services.ocr import PageOcr, create_ocr_engine
+from services.parsing import DocumentParserPool, is_usable_text
+from utils.cache import DiskCache
+from utils.spool import spool_upload
 
 logger = structlog.stdlib.get_logger()
 
+parser_pool = DocumentParserPool(
+    settings.PARSER_POOL_SIZE, settings.PARSER_PAGES_PER_TASK, settings.OCR_MIN_PAGE_CHARS
+)
+
+# Called with the name of each pipeline stage as it starts
+StageCallback = Callable[[str], Awaitable[None]]
+
+
+async def _noop_stage(stage: str) -> None:
+    return None
+
 
 class DocumentProcessor:
     def __init__(self):
@@ -38,10 +56,8 @@ class DocumentProcessor:
             api_key=self.openai_api_key, model=settings.EMBEDDINGS_MODEL
         )
         self.base_namespace = "resume_documents"
-        self.vectorstore = PineconeVectorStore(
-            index_name=self.index_name,
-            embedding=self.embeddings,
-            pinecone_api_key=self.pinecone_api_key,
+        self.page_ocr = PageOcr(
+            create_ocr_engine(), DiskCache(os.path.join(settings.CACHE_DIR, "ocr"))
         )
         self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=25000, chunk_overlap=200, add_start_index=True
@@ -54,6 +70,12 @@ class DocumentProcessor:
         self.exp_tool = self.llm.with_structured_output(schema=ExperienceList)
         self.skill_tool = self.llm.with_structured_output(schema=SkillList)
         self.project_tool = self.llm.with_structured_output(schema=ProjectList)
+        self.resume_tool = self.llm.with_structured_output(schema=ResumeExtraction)
+        self.extraction_mode = settings.EXTRACTION_MODE
+        # Shared by every upload handled by this process, so concurrent uploads
+        # can't fan out more than EXTRACTION_MAX_CONCURRENCY calls to the LLM.
+        self.extraction_semaphore = asyncio.Semaphore(settings.EXTRACTION_MAX_CONCURRENCY)
+        self.section_timeout = settings.EXTRACTION_SECTION_TIMEOUT
         self.base_prompt = ChatPromptTemplate.from_messages(
             [
                 (
@@ -70,36 +92,37 @@ class DocumentProcessor:
                 ("human", "{text}"),
             ]
         )
+        self.extraction_cache = create_extraction_cache(
+            settings.LLM_MODEL, self.base_prompt.pretty_repr()
+        )
 
-    async def load_and_split_document(self, file_path: str) -> List[Document]:
-        if file_path.endswith(".pdf"):
-            loader = PyPDFLoader(file_path)
-        elif file_path.endswith(".docx"):
-            loader = Docx2txtLoader(file_path)
-        else:
-            raise ValueError(f"Unsupported file type: {file_path}")
+    async def load_and_split_document(
+        self, file_path: str, data: Optional[bytes] = None
+    ) -> List[Document]:
+        """
+        Load a resume into per-page documents. `file_path` names the document;
+        when `data` is given the document is parsed from memory instead of disk.
 
-        documents = await loader.aload()
+        Text comes from the parser pool's local tiers first. Only PDF pages
+        that are still without usable text are sent to OCR, one page at a time.
+        """
+        source = data if data is not None else file_path
+        documents = await parser_pool.parse(source, file_path)
         await logger.info(f"1st Loaded {len(documents)} documents from {file_path}")
-        # check if the pdf is empty
-        if (
-            file_path.endswith(".pdf")
-            and len(documents) == 1
-            and documents[0].page_content == ""
-        ):
-            await logger.info(f"Empty PDF file: {file_path}")
-            loader = UnstructuredLoader(
-                api_key=settings.UNSTRUCTURED_API_KEY,
-                url="https://api.unstructured.io/general/v0/general",
-                file_path=file_path,
-                strategy="hi_res",  # "fast" or "hi_res"
-                partition_via_api=True,
-                coordinates=True,
-            )
-            documents = await loader.aload()
-            return documents
 
-        if len(documents) == 0:
+        empty_pages = [
+            i
+            for i, doc in enumerate(documents)
+            if not is_usable_text(doc.page_content, settings.OCR_MIN_PAGE_CHARS)
+        ]
+        if file_path.lower().endswith(".pdf") and empty_pages:
+            await logger.info(f"OCR for pages {empty_pages} of {file_path}")
+            pages = await parser_pool.pages_for_ocr(source, empty_pages)
+            texts = await self.page_ocr.ocr_pages(pages, os.path.basename(file_path), empty_pages)
+            for i, text in zip(empty_pages, texts):
+                documents[i].page_content = text
+
+        if not any(doc.page_content.strip() for doc in documents):
             raise ValueError(f"Empty document: {file_path}")
         return documents
 
@@ -112,55 +135,99 @@ class DocumentProcessor:
         content = "\n\n".join((f"{doc.page_content}") for doc in docs)
         return Document(page_content=content, metadata={"id": namespace})
 
+    @cached_property
+    def index(self) -> Index:
+        # Looks the index up over the network, so it is only built when first needed
+        return Pinecone(api_key=self.pinecone_api_key, source_tag="langchain").Index(self.index_name)
+
+    @cached_property
+    def vectorstore(self) -> PineconeVectorStore:
+        return PineconeVectorStore(index=self.index, embedding=self.embeddings)
+
+    async def get_vectorstore(self) -> PineconeVectorStore:
+        """The vector store, built in a thread on first use so the event loop isn't blocked."""
+        if "vectorstore" not in self.__dict__:
+            await asyncio.to_thread(lambda: self.vectorstore)
+        return self.vectorstore
+
+    async def delete_resume_vectors(self, namespace: str):
+        """Delete the chunks indexed for one resume, listed by their id prefix (serverless indexes)."""
+        await self.get_vectorstore()
+
+        def delete():
+            for ids in self.index.list(prefix=f"{namespace}#", namespace=self.base_namespace):
+                self.index.delete(ids=ids, namespace=self.base_namespace)
+
+        await asyncio.to_thread(delete)
+
     def retrieve_docs(self, query: str) -> List[Document]:
         results = self.vectorstore.similarity_search(
             query, k=self.top_k, namespace=self.base_namespace
         )
         return results
-    
-    def retrieve_docs_serialized(self,query: str) -> str:
-        results = self.vectorstore.similarity_search(
+
+    async def aretrieve_docs(self, query: str) -> List[Document]:
+        vectorstore = await self.get_vectorstore()
+        return await vectorstore.asimilarity_search(
             query, k=self.top_k, namespace=self.base_namespace
         )
+
+    async def aretrieve_docs_serialized(self, query: str) -> str:
+        results = await self.aretrieve_docs(query)
         if not results:
             return "No results found"
-        serialized = self.serialize_docs(results)
-        return serialized
+        return self.serialize_docs(results)
 
-    async def process_file_upload(self, file: UploadFile, namespace: str):
-        temp_file_path = f"temp_{file.filename}"
+    async def process_file_upload(
+        self,
+        file: UploadFile,
+        namespace: str,
+        on_stage: Optional[StageCallback] = None,
+    ):
+        on_stage = on_stage or _noop_stage
 
-        try:
-            # Save the uploaded file to a temporary file
-            with open(temp_file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-            await logger.info(f"Saved file to {temp_file_path}")
+        await on_stage("parsing")
+        async with spool_upload(file) as upload:
+            if upload.path:
+                await logger.info(f"Spooled {upload.filename} to {upload.path}")
             # Load and split the document
-            loaded_docs = await self.load_and_split_document(temp_file_path)
-            single_doc = self.combine_docs(loaded_docs, namespace)
-            documents = self.text_splitter.split_documents([single_doc])
-            await logger.info(f"Loaded and split {len(documents)} documents")
-            ids = await self.vectorstore.aadd_documents(documents, namespace=self.base_namespace)
-            await logger.info(
-                f"Indexed {len(ids)} documents and added to pinecone with the namespace {namespace}"
+            loaded_docs = await self.load_and_split_document(
+                upload.path or upload.filename, upload.data
             )
-            content = self.serialize_docs(documents)
-            (
-                candidate,
-                certs,
-                edu,
-                exp,
-                skills,
-                projects,
-            ) = await self.extract_candidate_info(content)
-            await logger.info(f"Extracted candidate info: {candidate}")
-
-            return candidate, certs, edu, exp, skills, projects, content
-
-        finally:
-            if os.path.exists(temp_file_path):
-                await logger.info(f"Removing temporary file {temp_file_path}")
-                os.remove(temp_file_path)
+        # Loader metadata, whitespace and repeated headers/footers only cost tokens
+        content = compact_pages([doc.page_content for doc in loaded_docs])
+        single_doc = Document(page_content=content, metadata={"id": namespace})
+        documents = self.text_splitter.split_documents([single_doc])
+        await logger.info(f"Loaded and split {len(documents)} documents")
+        await on_stage("indexing")
+        vectorstore = await self.get_vectorstore()
+        # chunk ids share the resume's namespace as a prefix, see delete_resume_vectors
+        ids = await vectorstore.aadd_documents(
+            documents,
+            ids=[f"{namespace}#{n}" for n in range(len(documents))],
+            namespace=self.base_namespace,
+        )
+        await logger.info(
+            f"Indexed {len(ids)} documents and added to pinecone with the namespace {namespace}"
+        )
+        await logger.info(
+            "Compacted resume text",
+            tokens=count_tokens(content, settings.LLM_MODEL),
+            raw_chars=sum(len(doc.page_content) for doc in loaded_docs),
+            compacted_chars=len(content),
+        )
+        await on_stage("extracting")
+        (
+            candidate,
+            certs,
+            edu,
+            exp,
+            skills,
+            projects,
+        ) = await self.extract_candidate_info(content)
+        await logger.info(f"Extracted candidate info: {candidate}")
+
+        return candidate, certs, edu, exp, skills, projects, content
 
     async def use_candidate_tool(self, text: str) -> CandidateExtraction:
         prompt = await self.base_prompt.ainvoke({"text": text})
@@ -192,14 +259,90 @@ class DocumentProcessor:
         projects = await self.project_tool.ainvoke(prompt)
         return projects
 
+    async def use_resume_tool(self, text: str) -> ResumeExtraction:
+        prompt = await self.base_prompt.ainvoke({"text": text})
+        resume = await self.resume_tool.ainvoke(prompt)
+        return resume
+
+    async def extract_section(self, section: str, schema, extractor, text: str):
+        """
+        Run a single section extractor under the shared concurrency budget and
+        timeout, serving it from the extraction cache when possible.
+        """
+        if self.extraction_cache:
+            cached = await self.extraction_cache.get(section, schema, text)
+            if cached is not None:
+                return cached
+        async with self.extraction_semaphore:
+            result = await asyncio.wait_for(extractor(text), timeout=self.section_timeout)
+        if self.extraction_cache:
+            await self.extraction_cache.set(section, schema, text, result)
+        return result
+
     async def extract_candidate_info(self, text: str):
-        candidate = await self.use_candidate_tool(text)
-        certs = await self.use_cert_tool(text)
-        edu = await self.use_edu_tool(text)
-        exp = await self.use_exp_tool(text)
-        skills = await self.use_skill_tool(text)
-        projects = await self.use_project_tool(text)
+        if self.extraction_mode == "unified":
+            return await self.extract_candidate_info_unified(text)
+        return await self.extract_candidate_info_sectioned(text)
+
+    async def extract_candidate_info_unified(self, text: str):
+        resume = await self.extract_section("resume", ResumeExtraction, self.use_resume_tool, text)
+        return (
+            resume.candidate,
+            resume.certifications,
+            resume.education,
+            resume.experience,
+            resume.skills,
+            resume.projects,
+        )
+
+    async def extract_candidate_info_sectioned(self, text: str):
+        sections = {
+            "candidate": (CandidateExtraction, self.use_candidate_tool, None),
+            "certifications": (CertificationList, self.use_cert_tool, CertificationList(certifications=[])),
+            "education": (EducationList, self.use_edu_tool, EducationList(education_entries=[])),
+            "experience": (ExperienceList, self.use_exp_tool, ExperienceList(experiences=[])),
+            "skills": (SkillList, self.use_skill_tool, SkillList(skills=[])),
+            "projects": (ProjectList, self.use_project_tool, ProjectList(projects=[])),
+        }
+        results = await asyncio.gather(
+            *(
+                self.extract_section(section, schema, extractor, text)
+                for section, (schema, extractor, _) in sections.items()
+            ),
+            return_exceptions=True,
+        )
+
+        extracted = []
+        for (section, (_, _, fallback)), result in zip(sections.items(), results):
+            if not isinstance(result, BaseException):
+                extracted.append(result)
+                continue
+            await logger.error(
+                "Section extraction failed",
+                section=section,
+                error=str(result.__class__.__name__),
+                error_info=str(result),
+            )
+            # Without the candidate's basic info there is nothing to attach the
+            # other sections to, so that failure is fatal for the upload.
+            if fallback is None:
+                raise result
+            extracted.append(fallback)
+
+        candidate, certs, edu, exp, skills, projects = extracted
         return candidate, certs, edu, exp, skills, projects
 
 
-document_processor = DocumentProcessor()
+_document_processor: DocumentProcessor | None = None
+
+
+def get_document_processor() -> DocumentProcessor:
+    """
+    The process-wide DocumentProcessor, built on first use rather than at
+    import, so importing the app doesn't create API clients. The lifespan
+    builds it up front.
+    """
+    global _document_processor
+    if _document_processor is None:
+        _document_processor = DocumentProcessor()
+    return _document_processor
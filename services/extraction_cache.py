@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import re
+from typing import Type, TypeVar
+
+import structlog
+from pydantic import BaseModel, ValidationError
+
+from core.config import settings
+from utils.cache import CacheBackend, DiskCache, RedisCache, get_cache_stats
+
+logger = structlog.stdlib.get_logger()
+
+Model = TypeVar("Model", bound=BaseModel)
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def schema_fingerprint(schema: Type[BaseModel]) -> str:
+    """Changes whenever a field, type or description of the schema changes."""
+    return _sha256(json.dumps(schema.model_json_schema(), sort_keys=True))
+
+
+class ExtractionCache:
+    """
+    Structured extraction outputs keyed by (normalized text, section schema,
+    model, prompt). Editing one schema only invalidates that section's entries,
+    and an entry that no longer validates against its schema is dropped.
+    """
+
+    def __init__(self, backend: CacheBackend, model_name: str, prompt: str):
+        self.backend = backend
+        self.model_name = model_name
+        self.prompt_hash = _sha256(prompt)
+        self.stats = get_cache_stats("extraction")
+        self._schema_fingerprints: dict[type, str] = {}
+
+    def key(self, schema: Type[BaseModel], text: str) -> str:
+        if schema not in self._schema_fingerprints:
+            self._schema_fingerprints[schema] = schema_fingerprint(schema)
+        fingerprint = self._schema_fingerprints[schema]
+        parts = [
+            _sha256(normalize_text(text)),
+            fingerprint,
+            self.model_name,
+            self.prompt_hash,
+        ]
+        # the schema and its version are spelled out, so entries can be told apart by key
+        return f"{_sha256('|'.join(parts))}.{schema.__name__}.{fingerprint[:16]}"
+
+    async def get(self, section: str, schema: Type[Model], text: str) -> Model | None:
+        key = self.key(schema, text)
+        try:
+            raw = await self.backend.get(key)
+        except Exception as e:
+            # a cache outage must never fail an extraction
+            await logger.warning("Extraction cache read failed", section=section, error=str(e))
+            raw = None
+        if raw is None:
+            self.stats.miss(section)
+            return None
+        try:
+            value = schema.model_validate_json(raw)
+        except ValidationError as e:
+            await logger.warning("Dropping unreadable extraction cache entry", section=section, error=str(e))
+            self.stats.miss(section)
+            try:
+                await self.backend.delete(key)
+            except Exception as e:
+                await logger.warning("Extraction cache delete failed", section=section, error=str(e))
+            return None
+        self.stats.hit(section)
+        return value
+
+    async def set(self, section: str, schema: Type[Model], text: str, value: Model):
+        try:
+            await self.backend.set(self.key(schema, text), value.model_dump_json())
+        except Exception as e:
+            await logger.warning("Extraction cache write failed", section=section, error=str(e))
+
+
+def create_extraction_cache(model_name: str, prompt: str) -> ExtractionCache | None:
+    if settings.EXTRACTION_CACHE_BACKEND == "none":
+        return None
+    if settings.EXTRACTION_CACHE_BACKEND == "disk":
+        backend = DiskCache(
+            os.path.join(settings.CACHE_DIR, "extraction"),
+            ttl=settings.EXTRACTION_CACHE_TTL,
+            max_entries=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+        )
+    else:
+        backend = RedisCache("extraction", ttl=settings.EXTRACTION_CACHE_TTL)
+    return ExtractionCache(backend, model_name, prompt)
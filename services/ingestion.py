@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import io
+import os
+import zipfile
+from collections.abc import AsyncIterator
+
+import structlog
+from fastapi import UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from crud.candidates import create_candidate_with_sections, get_candidate, get_candidate_by_content_hash
+from database import sessionmanager
+from models import Candidate
+from schema.candidates import CandidateCreate
+from schema.certificates import CertificationBase
+from schema.education import EducationBase
+from schema.experience import ExperienceBase
+from schema.projects import ProjectBase
+from schema.skills import SkillCreate
+from services.candidate_cache import candidate_cache
+from services.documents import StageCallback, get_document_processor
+from services.query_cache import bump_data_version
+from utils.singleflight import SingleFlight
+
+logger = structlog.stdlib.get_logger()
+
+ALLOWED_EXTENSIONS = [".pdf", ".docx"]
+
+# Uploads of the same file that are in flight in this process share one run.
+upload_flights = SingleFlight()
+
+
+async def ingest_resume(
+    db_session: AsyncSession,
+    file: UploadFile,
+    content_hash: str | None = None,
+    on_stage: StageCallback | None = None,
+) -> Candidate:
+    """
+    Parse, index and extract a resume, then persist the candidate and its sections.
+
+    If another upload of the same file (on another worker, or one that missed
+    the content hash check) committed first, that candidate is returned and
+    the vectors indexed by this run are deleted.
+    """
+    namespace = os.urandom(10).hex()
+    document_processor = get_document_processor()
+    candidate, certs, edu, exp, skills, projects, content = await document_processor.process_file_upload(
+        file, namespace, on_stage=on_stage
+    )
+    if on_stage:
+        await on_stage("persisting")
+
+    try:
+        candidate = await create_candidate_with_sections(
+            db_session,
+            CandidateCreate(
+                **candidate.model_dump(),
+                embeddings_namespace=namespace,
+                status="active",
+                content=content,
+                content_hash=content_hash,
+            ),
+            certifications=[CertificationBase(**cert.model_dump()) for cert in certs.certifications],
+            educations=[EducationBase(**education.model_dump()) for education in edu.education_entries],
+            experiences=[ExperienceBase(**experience.model_dump()) for experience in exp.experiences],
+            projects=[ProjectBase(**project.model_dump()) for project in projects.projects],
+            skills=[SkillCreate(**skill.model_dump()) for skill in skills.skills],
+        )
+    except IntegrityError:
+        # create_candidate_with_sections rolled back, so the session can look the winner up
+        existing = await get_candidate_by_content_hash(db_session, content_hash) if content_hash else None
+        if existing is None:
+            raise
+        await logger.info("Duplicate upload lost the insert race", candidate_id=existing.id, content_hash=content_hash)
+        try:
+            await document_processor.delete_resume_vectors(namespace)
+        except Exception as e:
+            await logger.warning("Could not delete orphaned resume vectors", namespace=namespace, error=str(e))
+        return existing
+
+    await logger.info("Candidate created", candidate_id=candidate.id)
+    if candidate_cache is not None:
+        await candidate_cache.invalidate(candidate.id, candidate.email)
+    await bump_data_version()
+    return candidate
+
+
+async def ingest_resume_once(
+    db_session: AsyncSession,
+    file: UploadFile,
+    content_hash: str,
+    on_stage: StageCallback | None = None,
+) -> Candidate:
+    """
+    Ingest a resume unless an identical file is being processed already.
+
+    Concurrent callers with the same content hash wait for the first caller's
+    run and then load the resulting candidate with their own session.
+    """
+
+    async def run() -> int:
+        candidate = await ingest_resume(db_session, file, content_hash, on_stage=on_stage)
+        return candidate.id
+
+    if upload_flights.in_flight(content_hash):
+        await logger.info("Joining in-flight upload", content_hash=content_hash)
+    candidate_id = await upload_flights.do(content_hash, run)
+    return await get_candidate(db_session, candidate_id)
+
+
+def expand_uploads(filename: str, data: bytes, max_files: int) -> list[tuple[str, bytes]]:
+    """
+    Return the resumes in an upload: the file itself, or the entries of a ZIP
+    archive. Archives are checked against the entry count and size limits from
+    their directory before any entry is decompressed.
+    """
+    if os.path.splitext(filename)[1].lower() != ".zip":
+        return [(filename, data)]
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise ValueError(f"Invalid ZIP archive: {filename}")
+    with archive:
+        members = [
+            info
+            for info in archive.infolist()
+            # skip folders and macOS resource forks
+            if not info.is_dir() and os.path.basename(info.filename) and not info.filename.startswith("__MACOSX/")
+        ]
+        if len(members) > max_files:
+            raise ValueError(f"Too many files in {filename}. At most {max_files} more resumes fit in this request")
+        for info in members:
+            if os.path.splitext(info.filename)[1].lower() == ".zip":
+                raise ValueError(f"Nested archives are not supported: {info.filename} in {filename}")
+            if info.file_size > settings.BULK_UPLOAD_MAX_FILE_BYTES:
+                raise ValueError(
+                    f"{info.filename} in {filename} is larger than {settings.BULK_UPLOAD_MAX_FILE_BYTES} bytes"
+                )
+        if sum(info.file_size for info in members) > settings.BULK_UPLOAD_MAX_ARCHIVE_BYTES:
+            raise ValueError(
+                f"{filename} expands to more than {settings.BULK_UPLOAD_MAX_ARCHIVE_BYTES} bytes"
+            )
+        # reads stop at the declared size and fail the CRC check, so a forged
+        # directory entry can't expand past the limits checked above
+        try:
+            return [(os.path.basename(info.filename), archive.read(info)) for info in members]
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Invalid ZIP archive: {filename} ({e})")
+
+
+async def ingest_file(filename: str, data: bytes) -> dict:
+    """Ingest one resume with its own DB session and report the outcome as a dict."""
+    result = {"filename": filename, "status": None, "candidate_id": None, "error": None}
+    if os.path.splitext(filename)[1].lower() not in ALLOWED_EXTENSIONS:
+        result["status"] = "skipped"
+        result["error"] = f"Unsupported file type. Allowed types are: {', '.join(ALLOWED_EXTENSIONS)}"
+        return result
+
+    content_hash = hashlib.sha256(data).hexdigest()
+    file = UploadFile(file=io.BytesIO(data), filename=filename, size=len(data))
+    try:
+        async with sessionmanager.session() as db_session:
+            existing = await get_candidate_by_content_hash(db_session, content_hash)
+            if existing:
+                result["status"] = "duplicate"
+                result["candidate_id"] = existing.id
+                return result
+            candidate = await ingest_resume_once(db_session, file, content_hash)
+        result["status"] = "created"
+        result["candidate_id"] = candidate.id
+    except Exception as e:
+        await logger.error("Bulk ingestion failed", filename=filename, error=str(e))
+        result["status"] = "failed"
+        result["error"] = str(e) or e.__class__.__name__
+    return result
+
+
+async def ingest_many(
+    files: list[tuple[str, bytes]], concurrency: int
+) -> AsyncIterator[dict]:
+    """
+    Ingest many resumes with at most `concurrency` in flight, yielding each
+    file's outcome as soon as it finishes (not in input order).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int, filename: str, data: bytes) -> dict:
+        async with semaphore:
+            return {"index": index, **await ingest_file(filename, data)}
+
+    tasks = [asyncio.create_task(run(i, name, data)) for i, (name, data) in enumerate(files)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # the client went away: don't keep processing the rest of the batch
+        for task in tasks:
+            task.cancel()
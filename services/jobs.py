@@ -0,0 +1,402 @@
+import asyncio
+import base64
+import hashlib
+import io
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+
+import structlog
+from fastapi import UploadFile
+from redis.asyncio import Redis
+
+from core.config import settings
+from crud.candidates import get_candidate_by_content_hash
+from database import sessionmanager
+from schema.jobs import IngestionJob
+from services.ingestion import ingest_resume_once
+
+logger = structlog.stdlib.get_logger()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobBackend(ABC):
+    """
+    Storage and queue for ingestion jobs.
+
+    A dequeued job id sits on the worker's processing list until the job is
+    finished or requeued, so jobs of a worker that dies mid-run can be put
+    back on the queue by `reclaim`.
+    """
+
+    @abstractmethod
+    async def enqueue(self, job: IngestionJob, payload: bytes) -> IngestionJob:
+        """
+        Store the job and queue it for a worker. If a job for the same content
+        hash is already in flight, that job is returned instead.
+        """
+
+    @abstractmethod
+    async def dequeue(self, worker: str, timeout: int) -> str | None:
+        """Block up to `timeout` seconds for the next job id, moving it to `worker`'s processing list."""
+
+    @abstractmethod
+    async def get(self, job_id: str) -> IngestionJob | None: ...
+
+    @abstractmethod
+    async def save(self, job: IngestionJob) -> None: ...
+
+    @abstractmethod
+    async def get_payload(self, job_id: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def ack(self, worker: str, job_id: str) -> None:
+        """Drop a job id from `worker`'s processing list without touching the job."""
+
+    @abstractmethod
+    async def requeue(self, worker: str, job: IngestionJob) -> None:
+        """Save the job and move it from `worker`'s processing list back to the head of the queue."""
+
+    @abstractmethod
+    async def finish(self, worker: str, job: IngestionJob) -> None:
+        """
+        Persist the job in its final state, drop it from `worker`'s processing
+        list and release the payload and the content hash claim.
+        """
+
+    async def heartbeat(self, workers: list[str], lease: int) -> None:
+        """Mark `workers` alive for `lease` seconds."""
+
+    async def reclaim(self) -> int:
+        """Requeue the in-flight jobs of workers whose lease ran out; returns how many."""
+        return 0
+
+    async def retire(self, workers: list[str]) -> None:
+        """Requeue whatever `workers` still hold and drop their leases, on shutdown."""
+
+
+class InMemoryJobBackend(JobBackend):
+    """Single-process backend, meant for tests and local development."""
+
+    def __init__(self):
+        # a deque rather than an asyncio.Queue, so requeued jobs can go back to the head
+        self._queue: deque[str] = deque()
+        self._ready = asyncio.Condition()
+        self._jobs: dict[str, IngestionJob] = {}
+        self._payloads: dict[str, bytes] = {}
+        self._hashes: dict[str, str] = {}
+
+    async def enqueue(self, job: IngestionJob, payload: bytes) -> IngestionJob:
+        if job.content_hash in self._hashes:
+            return self._jobs[self._hashes[job.content_hash]]
+        self._hashes[job.content_hash] = job.id
+        self._jobs[job.id] = job
+        self._payloads[job.id] = payload
+        async with self._ready:
+            self._queue.append(job.id)
+            self._ready.notify()
+        return job
+
+    async def dequeue(self, worker: str, timeout: int) -> str | None:
+        async with self._ready:
+            try:
+                await asyncio.wait_for(self._ready.wait_for(lambda: self._queue), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+            return self._queue.popleft()
+
+    async def get(self, job_id: str) -> IngestionJob | None:
+        return self._jobs.get(job_id)
+
+    async def save(self, job: IngestionJob) -> None:
+        self._jobs[job.id] = job
+
+    async def get_payload(self, job_id: str) -> bytes | None:
+        return self._payloads.get(job_id)
+
+    async def ack(self, worker: str, job_id: str) -> None:
+        pass
+
+    async def requeue(self, worker: str, job: IngestionJob) -> None:
+        self._jobs[job.id] = job
+        async with self._ready:
+            self._queue.appendleft(job.id)
+            self._ready.notify()
+
+    async def finish(self, worker: str, job: IngestionJob) -> None:
+        self._jobs[job.id] = job
+        self._payloads.pop(job.id, None)
+        if self._hashes.get(job.content_hash) == job.id:
+            del self._hashes[job.content_hash]
+
+
+class RedisJobBackend(JobBackend):
+    """Backend shared by every API replica pointing at the same Redis."""
+
+    queue_key = "ingestion:queue"
+    processing_prefix = "ingestion:processing:"
+
+    def __init__(self, redis: Redis, ttl: int):
+        self.redis = redis
+        self.ttl = ttl
+
+    def _job_key(self, job_id: str) -> str:
+        return f"ingestion:job:{job_id}"
+
+    def _payload_key(self, job_id: str) -> str:
+        return f"ingestion:payload:{job_id}"
+
+    def _hash_key(self, content_hash: str) -> str:
+        return f"ingestion:hash:{content_hash}"
+
+    def _processing_key(self, worker: str) -> str:
+        return f"{self.processing_prefix}{worker}"
+
+    def _lease_key(self, worker: str) -> str:
+        return f"ingestion:lease:{worker}"
+
+    async def enqueue(self, job: IngestionJob, payload: bytes) -> IngestionJob:
+        claimed = await self.redis.set(self._hash_key(job.content_hash), job.id, nx=True, ex=self.ttl)
+        if not claimed:
+            existing = await self.get(await self.redis.get(self._hash_key(job.content_hash)))
+            if existing:
+                return existing
+            await self.redis.set(self._hash_key(job.content_hash), job.id, ex=self.ttl)
+
+        # the client decodes responses, so the file travels base64 encoded
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+            pipe.set(self._payload_key(job.id), base64.b64encode(payload).decode(), ex=self.ttl)
+            pipe.lpush(self.queue_key, job.id)
+            await pipe.execute()
+        return job
+
+    async def dequeue(self, worker: str, timeout: int) -> str | None:
+        # jobs are pushed on the left and taken from the right
+        return await self.redis.blmove(self.queue_key, self._processing_key(worker), timeout, "RIGHT", "LEFT")
+
+    async def get(self, job_id: str | None) -> IngestionJob | None:
+        if not job_id:
+            return None
+        raw = await self.redis.get(self._job_key(job_id))
+        return IngestionJob.model_validate_json(raw) if raw else None
+
+    async def save(self, job: IngestionJob) -> None:
+        await self.redis.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+
+    async def get_payload(self, job_id: str) -> bytes | None:
+        raw = await self.redis.get(self._payload_key(job_id))
+        return base64.b64decode(raw) if raw else None
+
+    async def ack(self, worker: str, job_id: str) -> None:
+        await self.redis.lrem(self._processing_key(worker), 1, job_id)
+
+    async def requeue(self, worker: str, job: IngestionJob) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+            pipe.lrem(self._processing_key(worker), 1, job.id)
+            pipe.rpush(self.queue_key, job.id)
+            await pipe.execute()
+
+    async def finish(self, worker: str, job: IngestionJob) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+            pipe.delete(self._payload_key(job.id))
+            pipe.lrem(self._processing_key(worker), 1, job.id)
+            await pipe.execute()
+        if await self.redis.get(self._hash_key(job.content_hash)) == job.id:
+            await self.redis.delete(self._hash_key(job.content_hash))
+
+    async def heartbeat(self, workers: list[str], lease: int) -> None:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for worker in workers:
+                pipe.set(self._lease_key(worker), 1, ex=lease)
+            await pipe.execute()
+
+    async def _requeue_all(self, worker: str) -> int:
+        moved = 0
+        # each LMOVE is atomic, so replicas reclaiming the same list never requeue a job twice
+        while await self.redis.lmove(self._processing_key(worker), self.queue_key, "RIGHT", "RIGHT"):
+            moved += 1
+        return moved
+
+    async def reclaim(self) -> int:
+        reclaimed = 0
+        async for key in self.redis.scan_iter(match=f"{self.processing_prefix}*"):
+            worker = key.removeprefix(self.processing_prefix)
+            if not await self.redis.exists(self._lease_key(worker)):
+                reclaimed += await self._requeue_all(worker)
+        return reclaimed
+
+    async def retire(self, workers: list[str]) -> None:
+        for worker in workers:
+            await self._requeue_all(worker)
+        await self.redis.delete(*(self._lease_key(worker) for worker in workers))
+
+
+class IngestionJobQueue:
+    """Accepts resume uploads as jobs and runs them on a pool of background workers."""
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        workers: int = 2,
+        poll_timeout: int = 5,
+        lease: int = 30,
+        max_attempts: int = 3,
+    ):
+        self.backend = backend
+        self.workers = workers
+        self.poll_timeout = poll_timeout
+        self.lease = lease
+        self.max_attempts = max_attempts
+        # unique per process, so a restarted replica never mistakes a dead worker's list for its own
+        instance = uuid.uuid4().hex[:12]
+        self.worker_names = [f"{instance}-{n}" for n in range(workers)]
+        self._tasks: list[asyncio.Task] = []
+
+    async def submit(self, filename: str, data: bytes) -> IngestionJob:
+        content_hash = hashlib.sha256(data).hexdigest()
+        now = _now()
+        job = IngestionJob(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            content_hash=content_hash,
+            created_at=now,
+            updated_at=now,
+        )
+
+        # Re-uploads of an already processed file finish immediately
+        async with sessionmanager.session() as db_session:
+            existing = await get_candidate_by_content_hash(db_session, content_hash)
+        if existing:
+            job.status = "succeeded"
+            job.stage = "done"
+            job.candidate_id = existing.id
+            await self.backend.save(job)
+            return job
+
+        job = await self.backend.enqueue(job, data)
+        await logger.info("Ingestion job queued", job_id=job.id, filename=filename)
+        return job
+
+    async def get(self, job_id: str) -> IngestionJob | None:
+        return await self.backend.get(job_id)
+
+    async def start(self):
+        # the leases go up before the first reclaim, so this process's fresh lists are never reclaimed
+        await self._renew()
+        self._tasks.append(asyncio.create_task(self._heartbeat(), name="ingestion-heartbeat"))
+        for worker in self.worker_names:
+            self._tasks.append(asyncio.create_task(self._worker(worker), name=f"ingestion-worker-{worker}"))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.backend.retire(self.worker_names)
+        except Exception as e:
+            # the jobs are reclaimed by another replica once the leases expire
+            await logger.warning("Could not release ingestion workers", error=str(e))
+
+    async def _renew(self):
+        await self.backend.heartbeat(self.worker_names, self.lease)
+        reclaimed = await self.backend.reclaim()
+        if reclaimed:
+            await logger.warning("Requeued ingestion jobs of dead workers", jobs=reclaimed)
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                await self._renew()
+            except Exception as e:
+                await logger.error("Ingestion heartbeat failed", error=str(e))
+
+    async def _worker(self, worker: str):
+        while True:
+            try:
+                job_id = await self.backend.dequeue(worker, self.poll_timeout)
+                if job_id is not None:
+                    await self.run_job(worker, job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # keep the worker alive if the backend hiccups
+                await logger.error("Ingestion worker error", worker=worker, error=str(e))
+                await asyncio.sleep(1)
+
+    async def run_job(self, worker: str, job_id: str):
+        job = await self.backend.get(job_id)
+        payload = await self.backend.get_payload(job_id)
+        if job is None or payload is None:
+            await logger.error("Ingestion job expired before it ran", job_id=job_id)
+            await self.backend.ack(worker, job_id)
+            return
+
+        if job.attempts >= self.max_attempts:
+            # every earlier run was lost with its worker, so this file is likely what takes them down
+            job.status = "failed"
+            job.error = f"Gave up after {job.attempts} attempts"
+            job.updated_at = _now()
+            await self.backend.finish(worker, job)
+            await logger.error("Ingestion job gave up", job_id=job.id, attempts=job.attempts)
+            return
+
+        # saved before the run, so the attempt still counts if this worker dies with the job
+        job.attempts += 1
+        job.status = "running"
+        job.updated_at = _now()
+        await self.backend.save(job)
+        stage_started = time.perf_counter()
+
+        async def on_stage(stage: str):
+            nonlocal stage_started
+            now = time.perf_counter()
+            if job.stage:
+                job.timings[job.stage] = round(now - stage_started, 3)
+            stage_started = now
+            job.stage = stage
+            job.updated_at = _now()
+            await self.backend.save(job)
+
+        file = UploadFile(file=io.BytesIO(payload), filename=job.filename, size=len(payload))
+        try:
+            async with sessionmanager.session() as db_session:
+                candidate = await ingest_resume_once(db_session, file, job.content_hash, on_stage=on_stage)
+            await on_stage("done")
+            job.status = "succeeded"
+            job.candidate_id = candidate.id
+        except asyncio.CancelledError:
+            # shutting down: the job starts over on the next worker, its payload and claim intact
+            job.status = "queued"
+            # a clean shutdown is not the job's fault, so it doesn't use up an attempt
+            job.attempts -= 1
+            job.stage = None
+            job.timings = {}
+            job.updated_at = _now()
+            await self.backend.requeue(worker, job)
+            await logger.info("Ingestion job requeued", job_id=job.id)
+            raise
+        except Exception as e:
+            await logger.error("Ingestion job failed", job_id=job.id, stage=job.stage, error=str(e))
+            job.status = "failed"
+            job.error = str(e) or e.__class__.__name__
+        job.updated_at = _now()
+        await self.backend.finish(worker, job)
+        await logger.info("Ingestion job finished", job_id=job.id, status=job.status, timings=job.timings)
+
+
+def create_job_backend(redis: Redis | None = None) -> JobBackend:
+    if settings.INGESTION_BACKEND == "memory":
+        return InMemoryJobBackend()
+    if redis is None:
+        raise ValueError("The redis ingestion backend needs a redis client")
+    return RedisJobBackend(redis, ttl=settings.INGESTION_JOB_TTL)
@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import io
+from abc import ABC, abstractmethod
+from typing import List
+
+import structlog
+from langchain_unstructured import UnstructuredLoader
+
+from core.config import settings
+from utils.cache import DiskCache
+
+logger = structlog.stdlib.get_logger()
+
+
+class OcrEngine(ABC):
+    """Turns a single-page PDF without a usable text layer into text."""
+
+    @property
+    @abstractmethod
+    def cache_tag(self) -> str:
+        """Names the engine and the settings that shape its output, for cache keys."""
+
+    @abstractmethod
+    async def ocr_page(self, page_pdf: bytes, name: str) -> str: ...
+
+
+class UnstructuredApiOcrEngine(OcrEngine):
+    """The Unstructured API's hi_res strategy. Slow and billed per page."""
+
+    strategy = "hi_res"
+
+    def __init__(self, api_key: str, url: str = "https://api.unstructured.io/general/v0/general"):
+        self.api_key = api_key
+        self.url = url
+
+    @property
+    def cache_tag(self) -> str:
+        return f"unstructured-api-{self.strategy}-{hashlib.sha256(self.url.encode()).hexdigest()[:8]}"
+
+    async def ocr_page(self, page_pdf: bytes, name: str) -> str:
+        loader = UnstructuredLoader(
+            api_key=self.api_key,
+            url=self.url,
+            file=io.BytesIO(page_pdf),
+            metadata_filename=name,
+            strategy=self.strategy,
+            partition_via_api=True,
+        )
+        elements = await loader.aload()
+        return "\n\n".join(element.page_content for element in elements)
+
+
+class LocalOcrEngine(OcrEngine):
+    """
+    unstructured's local OCR (Tesseract), for development and tests without
+    API access. Needs unstructured's PDF extras and tesseract installed.
+    """
+
+    strategy = "ocr_only"
+
+    @property
+    def cache_tag(self) -> str:
+        return f"local-{self.strategy}"
+
+    def _partition(self, page_pdf: bytes) -> str:
+        from unstructured.partition.pdf import partition_pdf
+
+        elements = partition_pdf(file=io.BytesIO(page_pdf), strategy=self.strategy)
+        return "\n\n".join(str(element) for element in elements)
+
+    async def ocr_page(self, page_pdf: bytes, name: str) -> str:
+        return await asyncio.to_thread(self._partition, page_pdf)
+
+
+class PageOcr:
+    """
+    OCRs pages through an engine, caching the text by page fingerprint and
+    engine, so switching OCR_ENGINE never serves the other engine's text.
+    """
+
+    def __init__(self, engine: OcrEngine, cache: DiskCache):
+        self.engine = engine
+        self.cache = cache
+
+    async def _ocr_page(self, fingerprint: str, page_pdf: bytes, name: str) -> str:
+        key = f"{fingerprint}.{self.engine.cache_tag}"
+        text = await self.cache.get(key)
+        if text is not None:
+            await logger.info("OCR cache hit", page=name, fingerprint=fingerprint, engine=self.engine.cache_tag)
+            return text
+        text = await self.engine.ocr_page(page_pdf, name)
+        await self.cache.set(key, text)
+        return text
+
+    async def ocr_pages(
+        self, pages: List[tuple[str, bytes]], name: str, page_numbers: List[int]
+    ) -> List[str]:
+        """OCR (fingerprint, single-page PDF) pairs concurrently, in order."""
+        return await asyncio.gather(
+            *(
+                self._ocr_page(fingerprint, page_pdf, f"{name}-page{number}.pdf")
+                for number, (fingerprint, page_pdf) in zip(page_numbers, pages)
+            )
+        )
+
+
+def create_ocr_engine() -> OcrEngine:
+    if settings.OCR_ENGINE == "local":
+        return LocalOcrEngine()
+    return UnstructuredApiOcrEngine(settings.UNSTRUCTURED_API_KEY)
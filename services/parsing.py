@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import docx2txt
+import pdfplumber
+from langchain_core.documents import Document
+from pypdf import PdfReader, PdfWriter
+
+
+def _open(source: str | bytes):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def is_usable_text(text: str | None, min_chars: int) -> bool:
+    return text is not None and len(text.strip()) >= min_chars
+
+
+def pdf_page_count(source: str | bytes) -> int:
+    return len(PdfReader(_open(source)).pages)
+
+
+def single_page_pdf(reader: PdfReader, index: int) -> bytes:
+    writer = PdfWriter()
+    writer.add_page(reader.pages[index])
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def page_fingerprint(reader: PdfReader, index: int) -> str:
+    """
+    SHA-256 of what is drawn on a page: its content stream and the images it
+    places. The same scanned page has the same fingerprint in any file.
+    """
+    page = reader.pages[index]
+    digest = hashlib.sha256()
+    contents = page.get_contents()
+    if contents is not None:
+        digest.update(contents.get_data())
+    resources = page.get("/Resources")
+    xobjects = resources.get_object().get("/XObject") if resources else None
+    if xobjects:
+        xobjects = xobjects.get_object()
+        for name in sorted(xobjects):
+            digest.update(name.encode())
+            digest.update(xobjects[name].get_object().get_data())
+    return digest.hexdigest()
+
+
+def _partition_fast(page_pdf: bytes) -> str | None:
+    """Local unstructured "fast" strategy, when unstructured's PDF extras are installed."""
+    try:
+        from unstructured.partition.pdf import partition_pdf
+    except ImportError:
+        return None
+    elements = partition_pdf(file=io.BytesIO(page_pdf), strategy="fast")
+    return "\n\n".join(str(element) for element in elements)
+
+
+def extract_pdf_pages(
+    source: str | bytes, start: int, end: int, min_chars: int = 0
+) -> List[str]:
+    """
+    Text of pages [start, end). Runs in a parser process, so it returns plain strings.
+
+    pdfplumber is tried first; pages with fewer than `min_chars` characters get
+    a second pass with unstructured's local fast strategy. Pages that are still
+    empty are left for OCR.
+    """
+    with pdfplumber.open(_open(source)) as pdf:
+        end = min(end, len(pdf.pages))
+        texts = [pdf.pages[i].extract_text() or "" for i in range(start, end)]
+
+    short = [i for i, text in enumerate(texts) if not is_usable_text(text, min_chars)]
+    if short:
+        reader = PdfReader(_open(source))
+        for i in short:
+            text = _partition_fast(single_page_pdf(reader, start + i))
+            if text is None:
+                break
+            if is_usable_text(text, min_chars):
+                texts[i] = text
+    return texts
+
+
+def extract_ocr_pages(source: str | bytes, pages: List[int]) -> List[tuple[str, bytes]]:
+    """(fingerprint, single-page PDF) for each page that needs OCR."""
+    reader = PdfReader(_open(source))
+    return [(page_fingerprint(reader, i), single_page_pdf(reader, i)) for i in pages]
+
+
+def parse_pdf(source: str | bytes, name: str) -> List[Document]:
+    """One document per page, like PyPDFLoader, from a path or the raw bytes."""
+    return [
+        Document(page_content=text, metadata={"source": name, "page": i})
+        for i, text in enumerate(extract_pdf_pages(source, 0, pdf_page_count(source)))
+    ]
+
+
+def parse_docx(source: str | bytes, name: str) -> List[Document]:
+    """A single document with the whole text, like Docx2txtLoader."""
+    return [Document(page_content=docx2txt.process(_open(source)), metadata={"source": name})]
+
+
+def parse_document(source: str | bytes, name: str) -> List[Document]:
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".pdf":
+        return parse_pdf(source, name)
+    if extension == ".docx":
+        return parse_docx(source, name)
+    raise ValueError(f"Unsupported file type: {name}")
+
+
+def _warm_up() -> int:
+    # importing the parsers is the slow part of a cold worker; by now it's done
+    return os.getpid()
+
+
+class DocumentParserPool:
+    """
+    Parses documents in a warm pool of worker processes, keeping CPU-bound text
+    extraction off the API's event loop. PDFs longer than `pages_per_task` are
+    split into page ranges that are extracted in parallel and put back in order.
+
+    With `workers=0` documents are parsed in a thread of this process instead.
+    """
+
+    def __init__(self, workers: int, pages_per_task: int, min_page_chars: int = 0):
+        self.workers = workers
+        self.pages_per_task = pages_per_task
+        self.min_page_chars = min_page_chars
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def start(self):
+        if self.workers <= 0 or self._executor is not None:
+            return
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers))
+        )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, fn, *args):
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+        if self._executor is None:
+            await self.start()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def parse(self, source: str | bytes, name: str) -> List[Document]:
+        if os.path.splitext(name)[1].lower() != ".pdf":
+            return await self._run(parse_document, source, name)
+
+        page_count = await self._run(pdf_page_count, source)
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        chunks = await asyncio.gather(
+            *(
+                self._run(extract_pdf_pages, source, start, end, self.min_page_chars)
+                for start, end in ranges
+            )
+        )
+        texts = [text for chunk in chunks for text in chunk]
+        return [
+            Document(page_content=text, metadata={"source": name, "page": i})
+            for i, text in enumerate(texts)
+        ]
+
+    async def pages_for_ocr(self, source: str | bytes, pages: List[int]) -> List[tuple[str, bytes]]:
+        return await self._run(extract_ocr_pages, source, pages)
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import re
+import time
+from contextvars import ContextVar
+
+import structlog
+
+from core.config import settings
+from utils.cache import CacheStats, get_cache_stats
+from utils.redis import get_shared_redis_client
+
+logger = structlog.stdlib.get_logger()
+
+# Bumped by every candidate write; cached results and answers from an older version are never served
+DATA_VERSION_KEY = "agent:data_version"
+
+_SQL_TOKEN = re.compile(
+    r"""
+    (?P<string>'(?:[^']|'')*'|\$\$.*?\$\$)
+    |(?P<identifier>"(?:[^"]|"")*")
+    |(?P<comment>--[^\n]*|/\*.*?\*/)
+    |(?P<space>\s+)
+    |(?P<word>[^'"\s,()=<>;$/-]+)
+    |(?P<char>.)
+    """,
+    re.S | re.X,
+)
+# No whitespace is kept around these, so "a = b" and "a=b" normalize alike
+_TIGHT = {",", "(", ")", "=", "<", ">", ";"}
+
+
+def normalize_sql(query: str) -> str:
+    """
+    Canonical text of a query for cache keys: comments dropped, whitespace
+    collapsed, keywords and unquoted identifiers lower-cased and the trailing
+    semicolon removed. String literals and quoted identifiers are kept as is.
+    """
+    tokens: list[str] = []
+    for match in _SQL_TOKEN.finditer(query):
+        kind, token = match.lastgroup, match.group()
+        if kind in ("space", "comment"):
+            if tokens and tokens[-1] != " " and tokens[-1] not in _TIGHT:
+                tokens.append(" ")
+            continue
+        if kind == "word":
+            token = token.lower()
+        if token in _TIGHT and tokens and tokens[-1] == " ":
+            tokens.pop()
+        tokens.append(token)
+    return "".join(tokens).strip().rstrip(";").strip()
+
+
+# Functions whose result changes between calls, so a query using them can't be reused
+_VOLATILE = re.compile(
+    r"\b(now|random|setseed|current_date|current_time|current_timestamp|localtime|localtimestamp"
+    r"|clock_timestamp|statement_timestamp|transaction_timestamp|timeofday|gen_random_uuid"
+    r"|uuid_generate_v[14]|nextval|currval|lastval|txid_current|pg_current_xact_id)\b"
+)
+
+
+def is_cacheable(normalized: str) -> bool:
+    return normalized.startswith(("select ", "with ")) and not _VOLATILE.search(normalized)
+
+
+_run_stats: ContextVar[CacheStats | None] = ContextVar("agent_query_cache_run_stats", default=None)
+
+
+def track_run_stats() -> CacheStats:
+    """
+    Count the query cache lookups of the agent run in the current context (and
+    the tasks it starts) on a fresh CacheStats, on top of the process totals.
+    """
+    stats = CacheStats()
+    _run_stats.set(stats)
+    return stats
+
+
+async def bump_data_version():
+    """Invalidate every cached agent query result and answer; call after candidate writes."""
+    try:
+        redis = await get_shared_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            # seeded from the clock, so a version key lost to eviction can't restart at an old number
+            pipe.set(DATA_VERSION_KEY, time.time_ns(), nx=True)
+            pipe.incr(DATA_VERSION_KEY)
+            await pipe.execute()
+    except Exception as e:
+        # cached results still expire after AGENT_SQL_CACHE_TTL
+        await logger.warning("Agent query cache invalidation failed", error=str(e))
+
+
+async def get_data_version() -> int | None:
+    """The current data version, None when Redis can't be reached."""
+    try:
+        redis = await get_shared_redis_client()
+        version = await redis.get(DATA_VERSION_KEY)
+        if version is None:
+            await redis.set(DATA_VERSION_KEY, time.time_ns(), nx=True)
+            version = await redis.get(DATA_VERSION_KEY)
+    except Exception as e:
+        await logger.warning("Could not read the data version", error=str(e))
+        return None
+    return int(version) if version is not None else None
+
+
+class AgentQueryCache:
+    """
+    Results of the agent's read-only SQL in Redis, keyed by normalized query.
+
+    Each entry records the data version it was read at; a lookup fetches the
+    current version with the entry in one round trip and treats older entries
+    as misses. Redis errors count as misses.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.stats = get_cache_stats("agent_sql")
+
+    @staticmethod
+    def _key(normalized: str) -> str:
+        return f"agent:sql:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+    def _count(self, hit: bool):
+        for stats in (self.stats, _run_stats.get()):
+            if stats is None:
+                continue
+            if hit:
+                stats.hit()
+            else:
+                stats.miss()
+
+    async def get(self, normalized: str) -> tuple[str | None, int | None]:
+        """The cached result, if current, and the data version to store a fresh result under."""
+        try:
+            redis = await get_shared_redis_client()
+            version, data = await redis.mget(DATA_VERSION_KEY, self._key(normalized))
+            if version is None:
+                await redis.set(DATA_VERSION_KEY, time.time_ns(), nx=True)
+        except Exception as e:
+            await logger.warning("Agent query cache read failed", error=str(e))
+            version, data = None, None
+        if data is not None and version is not None:
+            try:
+                entry = json.loads(data)
+                current = entry["version"] == int(version)
+            except (ValueError, TypeError, KeyError) as e:
+                # corrupt or from an older format; the fresh result overwrites it
+                await logger.warning("Unreadable agent query cache entry", error=str(e))
+                current = False
+            if current:
+                self._count(hit=True)
+                return entry["result"], int(version)
+        self._count(hit=False)
+        return None, int(version) if version is not None else None
+
+    async def set(self, normalized: str, result: str, version: int | None):
+        """Store a result read at `version`; a write since then makes it stale right away."""
+        if version is None:
+            return
+        try:
+            redis = await get_shared_redis_client()
+            await redis.set(
+                self._key(normalized), json.dumps({"version": version, "result": result}), ex=self.ttl
+            )
+        except Exception as e:
+            await logger.warning("Agent query cache write failed", error=str(e))
+
+
+agent_query_cache = AgentQueryCache(settings.AGENT_SQL_CACHE_TTL) if settings.AGENT_SQL_CACHE_ENABLED else None
@@ -0,0 +1,82 @@
+import re
+import unicodedata
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import SkillAlias
+
+logger = structlog.stdlib.get_logger()
+
+# Spellings the LLM commonly emits for the same skill. Keys and values are
+# normalized on load, so they can be written naturally. Extra aliases can be
+# added to the `skill_aliases` table without a deploy.
+SEED_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "nextjs": "next.js",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "mssql": "sql server",
+    "microsoft sql server": "sql server",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+    "sklearn": "scikit-learn",
+    "ms excel": "excel",
+    "microsoft excel": "excel",
+    "ml": "machine learning",
+    "nlp": "natural language processing",
+    "cicd": "ci/cd",
+}
+
+# "Python 3", "Angular v12", "Java 8.0"
+_TRAILING_VERSION = re.compile(r"\s+v?\d+(\.\d+)*(\.x)?$")
+
+
+def normalize_skill_name(name: str) -> str:
+    """Case-fold, collapse whitespace and drop bullets and trailing version numbers."""
+    name = unicodedata.normalize("NFKC", name).casefold()
+    name = re.sub(r"\s+", " ", name).strip(" -_,;:|*•·").rstrip(".")
+    return _TRAILING_VERSION.sub("", name) or name
+
+
+class SkillCanonicalizer:
+    """Resolves a skill name to its canonical name through the normalizer and the alias table."""
+
+    def __init__(self, aliases: dict[str, str]):
+        self._seed = {normalize_skill_name(a): normalize_skill_name(c) for a, c in aliases.items()}
+        self._aliases = dict(self._seed)
+
+    def canonicalize(self, name: str) -> str:
+        normalized = normalize_skill_name(name)
+        return self._aliases.get(normalized, normalized)
+
+    async def load(self, db_session: AsyncSession):
+        """Replace the lookup with the seed aliases plus the `skill_aliases` table."""
+        result = await db_session.execute(select(SkillAlias.alias, SkillAlias.canonical_name))
+        aliases = dict(self._seed)
+        aliases.update((normalize_skill_name(a), normalize_skill_name(c)) for a, c in result.all())
+        self._aliases = aliases
+        await logger.info("Skill aliases loaded", aliases=len(aliases))
+
+
+skill_canonicalizer = SkillCanonicalizer(SEED_ALIASES)
@@ -0,0 +1,4 @@
+from utils.logger import configure_logger
+
+# Same logger setup as main.py: the services await their log calls
+configure_logger()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from services.answer_cache import AnswerLookup, SemanticAnswerCache
+
+
+def _cache(max_entries: int) -> SemanticAnswerCache:
+    return SemanticAnswerCache(embeddings=None, threshold=0.95, ttl=3600, max_entries=max_entries)
+
+
+def _lookup(*vector: float) -> AnswerLookup:
+    return AnswerLookup(hit=None, vector=np.asarray(vector, dtype=np.float32), version=None)
+
+
+def test_zero_max_entries_keeps_nothing():
+    cache = _cache(0)
+
+    cache.store(_lookup(1.0, 0.0), "Who knows Python?", "Jane Doe")
+
+    assert len(cache) == 0
+
+
+def test_oldest_answer_is_dropped_past_max_entries():
+    cache = _cache(2)
+
+    cache.store(_lookup(1.0, 0.0), "first", "a")
+    cache.store(_lookup(0.0, 1.0), "second", "b")
+    cache.store(_lookup(0.6, 0.8), "third", "c")
+
+    assert [question for _, question, _ in cache._entries] == ["second", "third"]
+    assert cache._vectors.shape == (2, 2)
@@ -0,0 +1,41 @@
+from services.compaction import compact_pages
+
+HEADER = "Jane Doe | jane.doe@example.com | +1 555 010 2030"
+
+
+def _page(number: int, total: int, body: list[str]) -> str:
+    return "\n".join([HEADER, "Senior Backend Engineer", *body, f"Page {number} of {total}"])
+
+
+def test_repeated_header_is_kept_once():
+    pages = [
+        _page(1, 3, ["Experience", "Acme Corp", "2018 – 2020"]),
+        _page(2, 3, ["Globex", "2020 – 2022", "Python, PostgreSQL"]),
+        _page(3, 3, ["Education", "BSc Computer Science", "2014 – 2018"]),
+    ]
+
+    text = compact_pages(pages)
+
+    assert text.count(HEADER) == 1
+    assert text.startswith(HEADER)
+    assert text.count("Senior Backend Engineer") == 1
+    assert text.count("Page 1 of 3") == 1
+    assert "Page 2 of 3" not in text
+    assert "Page 3 of 3" not in text
+
+
+def test_edge_lines_that_differ_only_in_digits_are_kept():
+    pages = [
+        "Acme Corp\n2018 – 2020\nBuilt the billing service",
+        "Globex\n2019 – 2021\nLed the data team",
+        "Initech\n2021 – 2023\nMigrated the monolith",
+    ]
+
+    text = compact_pages(pages)
+
+    for years in ("2018 – 2020", "2019 – 2021", "2021 – 2023"):
+        assert years in text
+
+
+def test_single_page_is_only_normalized():
+    assert compact_pages(["  Jane   Doe \n\n\nPython  "]) == "Jane Doe\nPython"
@@ -0,0 +1,101 @@
+import asyncio
+import io
+
+from fastapi import UploadFile
+from langchain_core.documents import Document
+
+from schema.candidates import CandidateExtraction
+from schema.extraction import ResumeExtraction
+from services.documents import DocumentProcessor
+from services.extraction_cache import ExtractionCache
+
+RESUME_TEXT = "Jane Doe\njane.doe@example.com\n\nExperience\nAcme Corp, Backend Engineer, 2018 – 2020"
+
+
+class MemoryBackend:
+    def __init__(self):
+        self.entries: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.entries.get(key)
+
+    async def set(self, key: str, value: str):
+        self.entries[key] = value
+
+    async def delete(self, key: str):
+        self.entries.pop(key, None)
+
+
+class FakeVectorStore:
+    async def aadd_documents(self, documents, ids=None, namespace=None):
+        return ids
+
+
+def _processor(backend: MemoryBackend) -> tuple[DocumentProcessor, list[str]]:
+    processor = DocumentProcessor()
+    processor.extraction_mode = "unified"
+    processor.extraction_cache = ExtractionCache(backend, "test-model", "test-prompt")
+    calls = []
+
+    async def load_and_split_document(file_path, data=None):
+        return [Document(page_content=RESUME_TEXT, metadata={"source": file_path, "page": 0})]
+
+    async def get_vectorstore():
+        return FakeVectorStore()
+
+    async def use_resume_tool(text):
+        calls.append(text)
+        return ResumeExtraction.model_validate(
+            {
+                "candidate": {"full_name": "Jane Doe", "email": "jane.doe@example.com"},
+                "certifications": {"certifications": []},
+                "education": {"education_entries": []},
+                "experience": {"experiences": []},
+                "skills": {"skills": []},
+                "projects": {"projects": []},
+            }
+        )
+
+    processor.load_and_split_document = load_and_split_document
+    processor.get_vectorstore = get_vectorstore
+    processor.use_resume_tool = use_resume_tool
+    return processor, calls
+
+
+def _upload() -> UploadFile:
+    return UploadFile(file=io.BytesIO(b"%PDF-1.4 resume"), filename="jane.pdf", size=15)
+
+
+def test_second_identical_extraction_is_a_hit():
+    processor, calls = _processor(MemoryBackend())
+
+    async def run():
+        # every upload gets a new random namespace, which must not reach the key
+        first = await processor.process_file_upload(_upload(), "namespace-one")
+        second = await processor.process_file_upload(_upload(), "namespace-two")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert first[0] == second[0]
+
+
+def test_unreadable_entry_is_a_miss_and_dropped():
+    backend = MemoryBackend()
+    cache = ExtractionCache(backend, "test-model", "test-prompt")
+    key = cache.key(CandidateExtraction, RESUME_TEXT)
+    backend.entries[key] = '{"full_name": 42'
+
+    cached = asyncio.run(cache.get("candidate", CandidateExtraction, RESUME_TEXT))
+
+    assert cached is None
+    assert key not in backend.entries
+    assert cache.stats.snapshot()["by_label"]["candidate"]["misses"] >= 1
+
+
+def test_key_changes_with_the_schema():
+    cache = ExtractionCache(MemoryBackend(), "test-model", "test-prompt")
+
+    assert cache.key(CandidateExtraction, RESUME_TEXT) != cache.key(ResumeExtraction, RESUME_TEXT)
+    assert cache.key(CandidateExtraction, RESUME_TEXT).split(".")[1] == "CandidateExtraction"
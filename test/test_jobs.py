@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime, timezone
+
+from schema.jobs import IngestionJob
+from services.jobs import InMemoryJobBackend, IngestionJobQueue
+
+
+def _job(job_id: str, **fields) -> IngestionJob:
+    now = datetime.now(timezone.utc)
+    return IngestionJob(id=job_id, filename=f"{job_id}.pdf", content_hash=job_id, created_at=now, updated_at=now, **fields)
+
+
+def test_requeued_job_goes_back_to_the_head():
+    backend = InMemoryJobBackend()
+
+    async def run():
+        await backend.enqueue(_job("first"), b"1")
+        await backend.enqueue(_job("second"), b"2")
+        taken = await backend.dequeue("worker", timeout=1)
+        await backend.requeue("worker", await backend.get(taken))
+        return [await backend.dequeue("worker", timeout=1) for _ in range(2)]
+
+    assert asyncio.run(run()) == ["first", "second"]
+
+
+def test_job_out_of_attempts_is_failed_without_running():
+    backend = InMemoryJobBackend()
+    queue = IngestionJobQueue(backend, workers=1, max_attempts=3)
+
+    async def run():
+        await backend.enqueue(_job("crashy", attempts=3), b"%PDF-1.4 resume")
+        job_id = await backend.dequeue("worker", timeout=1)
+        await queue.run_job("worker", job_id)
+        return await backend.get(job_id), await backend.get_payload(job_id)
+
+    job, payload = asyncio.run(run())
+
+    assert job.status == "failed"
+    assert job.attempts == 3
+    assert "3 attempts" in job.error
+    assert payload is None
@@ -0,0 +1,217 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from typing import Generic, Hashable, Iterable, Protocol, TypeVar
+
+from utils.redis import get_shared_redis_client
+
+
+class CacheStats:
+    """Hit and miss counters, optionally broken down by a label such as the section name."""
+
+    def __init__(self):
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self.latency_count: Counter[str] = Counter()
+        self.latency_total: Counter[str] = Counter()
+        self.latency_max: dict[str, float] = {}
+
+    def hit(self, label: str = "all"):
+        self.hits[label] += 1
+
+    def miss(self, label: str = "all"):
+        self.misses[label] += 1
+
+    def observe(self, label: str, seconds: float):
+        """Record how long a lookup took, e.g. labelled "hit" or "miss"."""
+        self.latency_count[label] += 1
+        self.latency_total[label] += seconds
+        self.latency_max[label] = max(self.latency_max.get(label, 0.0), seconds)
+
+    def snapshot(self) -> dict:
+        labels = sorted(set(self.hits) | set(self.misses))
+        hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        snapshot = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "by_label": {
+                label: {"hits": self.hits[label], "misses": self.misses[label]} for label in labels
+            },
+        }
+        if self.latency_count:
+            snapshot["latency_ms"] = {
+                label: {
+                    "count": count,
+                    "avg": round(self.latency_total[label] / count * 1000, 3),
+                    "max": round(self.latency_max[label] * 1000, 3),
+                }
+                for label, count in sorted(self.latency_count.items())
+            }
+        return snapshot
+
+
+# Every cache registers its stats here so /health/cache can report them
+cache_stats: dict[str, CacheStats] = {}
+
+
+def get_cache_stats(name: str) -> CacheStats:
+    return cache_stats.setdefault(name, CacheStats())
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A bounded in-process mapping that evicts the least recently used keys
+    first. With `ttl`, entries older than `ttl` seconds are treated as missing.
+    """
+
+    def __init__(self, max_entries: int, ttl: float | None = None, stats: CacheStats | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats = stats
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl is not None and time.monotonic() - entry[0] > self.ttl:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            if self.stats:
+                self.stats.miss()
+            return None
+        self._entries.move_to_end(key)
+        if self.stats:
+            self.stats.hit()
+        return entry[1]
+
+    def set(self, key: K, value: V):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update(self, items: Iterable[tuple[K, V]]):
+        for key, value in items:
+            self.set(key, value)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str): ...
+
+    async def delete(self, key: str): ...
+
+
+class DiskCache:
+    """
+    String values in files under `directory`, one file per key. Survives restarts.
+
+    Entries older than `ttl` seconds are treated as missing. When `max_entries`
+    is set, the least recently used entries (by file mtime, which reads bump)
+    are evicted once the cache grows past it.
+    """
+
+    EVICT_EVERY = 100  # sets between eviction sweeps
+
+    def __init__(self, directory: str, ttl: int | None = None, max_entries: int | None = None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._sets = 0
+
+    def _path(self, key: str) -> str:
+        # fan out into subfolders so no single directory gets huge
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read(self, key: str) -> str | None:
+        path = self._path(key)
+        with contextlib.suppress(FileNotFoundError):
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, encoding="utf-8") as f:
+                value = f.read()
+            if self.max_entries is not None:
+                os.utime(path)  # mark as recently used
+            return value
+        return None
+
+    def _write(self, key: str, value: str):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                with contextlib.suppress(FileNotFoundError):
+                    entries.append((os.path.getmtime(path), path))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[: len(entries) - self.max_entries]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._read, key)
+
+    def _delete(self, key: str):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path(key))
+
+    async def set(self, key: str, value: str):
+        await asyncio.to_thread(self._write, key, value)
+        self._sets += 1
+        if self.max_entries is not None and self._sets % self.EVICT_EVERY == 0:
+            await asyncio.to_thread(self._evict)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._delete, key)
+
+
+class RedisCache:
+    """
+    String values in Redis under `prefix`. Reads refresh the TTL, so with a
+    TTL entries expire least-recently-used first; Redis' own maxmemory policy
+    bounds the total size.
+    """
+
+    def __init__(self, prefix: str, ttl: int | None = None):
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def get(self, key: str) -> str | None:
+        redis = await get_shared_redis_client()
+        if self.ttl is None:
+            return await redis.get(f"{self.prefix}:{key}")
+        return await redis.getex(f"{self.prefix}:{key}", ex=self.ttl)
+
+    async def set(self, key: str, value: str):
+        redis = await get_shared_redis_client()
+        await redis.set(f"{self.prefix}:{key}", value, ex=self.ttl)
+
+    async def delete(self, key: str):
+        redis = await get_shared_redis_client()
+        await redis.delete(f"{self.prefix}:{key}")
@@ -0,0 +1,28 @@
+import bisect
+
+
+class Histogram:
+    """Counts of observations per bucket; `buckets` are upper bounds in milliseconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last one is "above every bound"
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, seconds: float):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        labels = [f"le_{bound:g}ms" for bound in self.buckets] + ["inf"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
@@ -0,0 +1,22 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque token for the keyset position right after the row (created_at, id)."""
+    payload = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = datetime.fromisoformat(created_at)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+    if created_at.tzinfo is None or not isinstance(id, int):
+        raise ValueError("Invalid pagination cursor")
+    return created_at, id
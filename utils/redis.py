@@ -2,6 +2,8 @@ import redis.asyncio as aioredis
 from redis.asyncio import Redis
 from core.config import settings
 
+_shared_redis_client: Redis | None = None
+
 
 async def get_redis_client() -> Redis:
     redis = await aioredis.from_url(
@@ -11,3 +13,18 @@ async def get_redis_client() -> Redis:
         decode_responses=True,
     )
     return redis
+
+
+async def get_shared_redis_client() -> Redis:
+    """Process-wide client reused by background workers and caches."""
+    global _shared_redis_client
+    if _shared_redis_client is None:
+        _shared_redis_client = await get_redis_client()
+    return _shared_redis_client
+
+
+async def close_shared_redis_client():
+    global _shared_redis_client
+    if _shared_redis_client is not None:
+        await _shared_redis_client.aclose()
+        _shared_redis_client = None
@@ -0,0 +1,91 @@
+import types
+import typing
+from collections.abc import Sequence
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Union
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel, EmailStr, TypeAdapter
+
+# Values of these types are already what pydantic would emit in JSON mode, or
+# something orjson encodes identically (datetimes with OPT_UTC_Z)
+_PASSTHROUGH = (str, int, float, bool, datetime, type(None), EmailStr)
+
+Serializer = Callable[[Any], Any]
+
+
+def _is_passthrough(annotation: Any) -> bool:
+    if typing.get_origin(annotation) in (Union, types.UnionType):
+        return all(_is_passthrough(arg) for arg in typing.get_args(annotation))
+    return annotation in _PASSTHROUGH
+
+
+def _model_class(annotation: Any) -> type[BaseModel] | None:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    return None
+
+
+def _field_serializer(annotation: Any) -> Serializer | None:
+    """None when the value can be passed to orjson as is."""
+    if _is_passthrough(annotation):
+        return None
+    if model := _model_class(annotation):
+        serialize = serializer_for(model)
+        return lambda value: None if value is None else serialize(value)
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin in (list, Sequence) and args and (model := _model_class(args[0])):
+        serialize = serializer_for(model)
+        return lambda values: [serialize(value) for value in values]
+    if origin in (Union, types.UnionType) and type(None) in args and len(args) == 2:
+        inner = _field_serializer(next(arg for arg in args if arg is not type(None)))
+        if inner is None:
+            return None
+        return lambda value: None if value is None else inner(value)
+    # anything unusual goes through pydantic, so the output can't drift
+    adapter = TypeAdapter(annotation)
+    return lambda value: adapter.dump_python(value, mode="json")
+
+
+@lru_cache(maxsize=None)
+def serializer_for(model: type[BaseModel]) -> Serializer:
+    """
+    A function turning an ORM row (or anything with the model's attributes)
+    into the dict `model.model_validate(row).model_dump(mode="json")` would
+    produce, minus the validation: attributes are read once, in field order,
+    following a plan built from the model's fields the first time.
+    """
+    plan = [(name, _field_serializer(field.annotation)) for name, field in model.model_fields.items()]
+
+    def serialize(obj: Any) -> dict:
+        return {
+            name: getattr(obj, name) if convert is None else convert(getattr(obj, name))
+            for name, convert in plan
+        }
+
+    return serialize
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def raw_json(data: str | bytes) -> orjson.Fragment:
+    """Already-encoded JSON to embed as is, e.g. a cached payload."""
+    return orjson.Fragment(data)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for content that is already JSON-ready (see serializer_for).
+    Returning it from an endpoint also skips FastAPI's response_model
+    validation, which stays in place for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,74 @@
+import asyncio
+import contextlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+
+from core.config import settings
+
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """An uploaded file held either in memory (`data`) or in a unique spool file (`path`)."""
+
+    filename: str
+    data: bytes | None = None
+    path: str | None = None
+
+    @property
+    def extension(self) -> str:
+        return os.path.splitext(self.filename)[1].lower()
+
+
+def _create_spool_file(spool_dir: str, suffix: str) -> tuple[int, str]:
+    os.makedirs(spool_dir, exist_ok=True)
+    return tempfile.mkstemp(prefix="upload_", suffix=suffix, dir=spool_dir)
+
+
+def _remove(path: str):
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+
+
+@contextlib.asynccontextmanager
+async def spool_upload(
+    file: UploadFile,
+    spool_dir: str | None = None,
+    in_memory_max_bytes: int | None = None,
+) -> AsyncIterator[SpooledUpload]:
+    """
+    Make an upload available for parsing without blocking the event loop.
+
+    Files up to `in_memory_max_bytes` stay in memory. Larger files are copied
+    chunk by chunk, in worker threads, to a uniquely named file in `spool_dir`,
+    which is removed on exit. Concurrent uploads with the same filename never
+    share a spool file.
+    """
+    spool_dir = spool_dir or settings.UPLOAD_SPOOL_DIR
+    if in_memory_max_bytes is None:
+        in_memory_max_bytes = settings.UPLOAD_IN_MEMORY_MAX_BYTES
+
+    await file.seek(0)
+    head = await file.read(in_memory_max_bytes + 1)
+    if len(head) <= in_memory_max_bytes:
+        yield SpooledUpload(filename=file.filename, data=head)
+        return
+
+    upload = SpooledUpload(filename=file.filename)
+    fd, upload.path = await asyncio.to_thread(
+        _create_spool_file, spool_dir, os.path.splitext(file.filename)[1].lower()
+    )
+    try:
+        with os.fdopen(fd, "wb") as out:
+            chunk = head
+            while chunk:
+                await asyncio.to_thread(out.write, chunk)
+                chunk = await file.read(SPOOL_CHUNK_SIZE)
+        yield upload
+    finally:
+        await asyncio.to_thread(_remove, upload.path)